@@ -209,6 +209,64 @@ class Tetris(StageTest):
                         '- - - - 0 0 - - - -\n- - - - 0 0 - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n\n'
                         )
 
+            ),
+
+            TestCase(
+                stdin='12 7\npiece\nI\nrotate\nright\nright\nright\nright\nright\ndown\ndown\nexit',
+                attach=('',
+                        '- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n\n'
+                        '- - - - - 0 - - - - - -\n- - - - - 0 - - - - - -\n- - - - - 0 - - - - - -\n- - - - - 0 - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n\n'
+                        '- - - - - - - - - - - -\n- - - - 0 0 0 0 - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n\n'
+                        '- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - 0 0 0 0 - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n\n'
+                        '- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - 0 0 0 0 - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n\n'
+                        '- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - 0 0 0 0 -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n\n'
+                        '- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - 0 0 0 0\n- - - - - - - - - - - -\n\n'
+                        '- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - 0 0 0 0\n\n'
+                        '- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - 0 0 0 0\n\n'
+                        '- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - - - - -\n- - - - - - - - 0 0 0 0\n\n'
+                        )
+
+            ),
+
+            TestCase(
+                stdin='4 8\npiece\nO\ndown\ndown\ndown\ndown\ndown\ndown\ndown\npiece\nI\nrotate\ndown\ndown\ndown\ndown\ndown\nbreak\nexit',
+                attach=('',
+                        '- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n\n'
+                        '- 0 0 -\n- 0 0 -\n- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n\n'
+                        '- - - -\n- 0 0 -\n- 0 0 -\n- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n\n'
+                        '- - - -\n- - - -\n- 0 0 -\n- 0 0 -\n- - - -\n- - - -\n- - - -\n- - - -\n\n'
+                        '- - - -\n- - - -\n- - - -\n- 0 0 -\n- 0 0 -\n- - - -\n- - - -\n- - - -\n\n'
+                        '- - - -\n- - - -\n- - - -\n- - - -\n- 0 0 -\n- 0 0 -\n- - - -\n- - - -\n\n'
+                        '- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n- 0 0 -\n- 0 0 -\n- - - -\n\n'
+                        '- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n- 0 0 -\n- 0 0 -\n\n'
+                        '- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n- 0 0 -\n- 0 0 -\n\n'
+                        '- 0 - -\n- 0 - -\n- 0 - -\n- 0 - -\n- - - -\n- - - -\n- 0 0 -\n- 0 0 -\n\n'
+                        '- - - -\n0 0 0 0\n- - - -\n- - - -\n- - - -\n- - - -\n- 0 0 -\n- 0 0 -\n\n'
+                        '- - - -\n- - - -\n0 0 0 0\n- - - -\n- - - -\n- - - -\n- 0 0 -\n- 0 0 -\n\n'
+                        '- - - -\n- - - -\n- - - -\n0 0 0 0\n- - - -\n- - - -\n- 0 0 -\n- 0 0 -\n\n'
+                        '- - - -\n- - - -\n- - - -\n- - - -\n0 0 0 0\n- - - -\n- 0 0 -\n- 0 0 -\n\n'
+                        '- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n0 0 0 0\n- 0 0 -\n- 0 0 -\n\n'
+                        '- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n0 0 0 0\n- 0 0 -\n- 0 0 -\n\n'
+                        '- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n- - - -\n- 0 0 -\n- 0 0 -\n\n'
+                        )
+
+            ),
+
+            TestCase(
+                stdin='10 6\npiece\nT\nright 3\ndrop\npiece\nI\nrotate\ndown 2\nleft 4\ndrop\nbreak\nexit',
+                attach=('',
+                        '- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n\n'
+                        '- - - - 0 - - - - -\n- - - - 0 0 - - - -\n- - - - 0 - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n\n'
+                        '- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - 0 - -\n- - - - - - - 0 0 -\n- - - - - - - 0 - -\n\n'
+                        '- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - 0 - -\n- - - - - - - 0 0 -\n- - - - - - - 0 - -\n\n'
+                        '- - - - 0 - - - - -\n- - - - 0 - - - - -\n- - - - 0 - - - - -\n- - - - 0 - - 0 - -\n- - - - - - - 0 0 -\n- - - - - - - 0 - -\n\n'
+                        '- - - - - - - - - -\n- - - 0 0 0 0 - - -\n- - - - - - - - - -\n- - - - - - - 0 - -\n- - - - - - - 0 0 -\n- - - - - - - 0 - -\n\n'
+                        '- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - 0 0 0 0 0 - -\n- - - - - - - 0 0 -\n- - - - - - - 0 - -\n\n'
+                        '- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - 0 - -\n- - - - - - - 0 0 -\n- 0 0 0 0 - - 0 - -\n\n'
+                        '- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - 0 - -\n- - - - - - - 0 0 -\n- 0 0 0 0 - - 0 - -\n\n'
+                        '- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - - - -\n- - - - - - - 0 - -\n- - - - - - - 0 0 -\n- 0 0 0 0 - - 0 - -\n\n'
+                        )
+
             )
         ]
 
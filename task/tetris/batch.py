@@ -0,0 +1,246 @@
+import numpy as np
+from shapes import SHAPES, spawn_column
+
+# command codes of BatchGame.step. NOOP leaves the board as it is
+NOOP = 0
+DOWN = 1
+LEFT = 2
+RIGHT = 3
+ROTATE = 4
+DROP = 5
+# code of each command read by main()
+COMMANDS = {"down": DOWN, "left": LEFT, "right": RIGHT, "rotate": ROTATE, "drop": DROP}
+
+
+def state_layout(dimensions, size):
+    """Describe the arrays with the state of the boards of a BatchGame.
+
+    Arguments:
+    dimensions -- list with int M and N grid dimensions
+    size -- int with the number B of boards
+    Return list with one (name, shape, dtype) tuple per array. The first dimension of every array is B
+    """
+    m, n = dimensions
+    return [("occupancy", (size, n, m), np.dtype(bool)), ("counts", (size, m), np.dtype(np.int64)),
+            ("shape", (size,), np.dtype(np.int64)), ("rotation", (size,), np.dtype(np.int64)),
+            ("row", (size,), np.dtype(np.int64)), ("column", (size,), np.dtype(np.int64)),
+            ("active", (size,), np.dtype(bool)), ("over", (size,), np.dtype(bool))]
+
+
+class BatchGame:
+    """BatchGame object that plays many games of the same grid size at once. The locked cells of every board are kept
+    in one B x N x M numpy array and each command is run on all the boards with numpy operations"""
+    def __init__(self, dimensions, size, arrays=None):
+        """The initializer for the class. All the boards start empty and without a piece, unless arrays are given.
+
+        Arguments:
+        dimensions -- list with int M and N grid dimensions
+        size -- int with the number B of boards
+        arrays -- dict with the state arrays described by state_layout, e.g views of shared memory. The game reads and
+        writes them in place. None to create new arrays
+        """
+        # m width n height
+        self.m = dimensions[0]
+        self.n = dimensions[1]
+        self.size = size
+        if arrays is None:
+            arrays = {name: np.zeros(shape, dtype=dtype) for name, shape, dtype in state_layout(dimensions, size)}
+        # occupancy is True where the cell on board b, row r and column c is locked
+        self.occupancy = arrays["occupancy"]
+        # counts has the number of locked cells of each column of each board. A column is full when its count is N
+        self.counts = arrays["counts"]
+        # shape tables of the SHAPES registry, padded to the same number of rotations and cells. Padding repeats the
+        # first cell, so it does not change collisions or locking
+        self.shape_names = list(SHAPES)
+        self.shape_ids = {name: index for index, name in enumerate(self.shape_names)}
+        rotations = max(len(SHAPES[name]) for name in self.shape_names)
+        cells = max(SHAPES[name].shape[1] for name in self.shape_names)
+        self.table = np.zeros((len(self.shape_names), rotations, cells, 2), dtype=np.int64)
+        self.rotations = np.zeros(len(self.shape_names), dtype=np.int64)
+        # padding is True for the cells added to a shape with fewer cells
+        self.padding = np.zeros((len(self.shape_names), cells), dtype=bool)
+        for index, name in enumerate(self.shape_names):
+            table = SHAPES[name]
+            self.table[index, :len(table), :table.shape[1]] = table
+            self.table[index, :len(table), table.shape[1]:] = table[:, :1]
+            self.rotations[index] = len(table)
+            self.padding[index, table.shape[1]:] = True
+        # piece of each board: shape id, rotation and origin. active is False when the board has no falling piece
+        self.shape = arrays["shape"]
+        self.rotation = arrays["rotation"]
+        self.row = arrays["row"]
+        self.column = arrays["column"]
+        self.active = arrays["active"]
+        # over is True for the boards where a column was completely filled
+        self.over = arrays["over"]
+        # index of each board, used to pick cells of the occupancy array
+        self.boards = np.arange(size)
+
+    def __repr__(self):
+        """Print of the batch"""
+        return f"BatchGame: {self.size} boards {self.m}x{self.n}; Active: {int(self.active.sum())}; Over: {int(self.over.sum())}"
+
+    def spawn(self, shapes):
+        """Create a piece on the top of the boards. Boards over are not changed.
+
+        Arguments:
+        shapes -- list with one shape name per board, or None to keep the board as it is. E.g ['T', None, 'I']
+        """
+        ids = np.array([-1 if shape is None else self.shape_ids[shape] for shape in shapes], dtype=np.int64)
+        new = (ids >= 0) & ~self.over
+        self.shape[new] = ids[new]
+        self.rotation[new] = 0
+        self.row[new] = 0
+        self.column[new] = spawn_column(self.m)
+        self.active |= new
+
+    def cells(self, rotation, row, column):
+        """Find the cells of the piece of every board for a rotation and an origin.
+
+        Arguments:
+        rotation -- numpy int array with the rotation of each board
+        row -- numpy int array with the row of the origin of each board
+        column -- numpy int array with the column of the origin of each board
+        Return two B x K numpy int arrays with the rows and the columns of the K cells of each piece
+        """
+        table = self.table[self.shape, rotation]
+        return table[:, :, 0] + row[:, None], table[:, :, 1] + column[:, None]
+
+    def inside(self, rows, columns):
+        """Verify which cells are within the grid walls and above the floor.
+
+        Arguments:
+        rows -- B x K numpy int array with the rows of the cells
+        columns -- B x K numpy int array with the columns of the cells
+        Return B numpy bool array, True for the boards where every cell is inside the grid
+        """
+        return ((columns >= 0) & (columns < self.m) & (rows < self.n)).all(axis=1)
+
+    def locked(self, rows, columns):
+        """Find which cells are locked. Cells outside the boards are never locked.
+
+        Arguments:
+        rows -- B x K numpy int array with the rows of the cells
+        columns -- B x K numpy int array with the columns of the cells
+        Return B x K numpy bool array, True where the cell is locked
+        """
+        inside = (rows >= 0) & (rows < self.n) & (columns >= 0) & (columns < self.m)
+        cells = self.occupancy[self.boards[:, None], np.clip(rows, 0, self.n - 1), np.clip(columns, 0, self.m - 1)]
+        return cells & inside
+
+    def full_column(self, rows, columns):
+        """Verify on each board if a column is completely filled, counting the piece cells as if they were locked.
+
+        Arguments:
+        rows -- B x K numpy int array with the rows of the piece cells
+        columns -- B x K numpy int array with the columns of the piece cells
+        Return B numpy bool array, True for the boards with a full column
+        """
+        inside = (rows >= 0) & (rows < self.n) & (columns >= 0) & (columns < self.m)
+        added = np.zeros_like(self.counts)
+        np.add.at(added, (np.broadcast_to(self.boards[:, None], rows.shape), np.clip(columns, 0, self.m - 1)),
+                  inside & ~self.locked(rows, columns) & ~self.padding[self.shape])
+        return (self.counts + added == self.n).any(axis=1)
+
+    def drop_distance(self, mask):
+        """Find how many rows each piece can move down before touching the floor or a locked cell.
+
+        Arguments:
+        mask -- B numpy bool array with the boards to check
+        Return B numpy int array with the number of rows. 0 for the boards not checked
+        """
+        distance = np.zeros(self.size, dtype=np.int64)
+        falling = mask.copy()
+        for rows in range(1, self.n + 1):
+            cell_rows, cell_columns = self.cells(self.rotation, self.row + rows, self.column)
+            falling &= self.inside(cell_rows, cell_columns) & ~self.locked(cell_rows, cell_columns).any(axis=1)
+            if not falling.any():
+                break
+            distance += falling
+        return distance
+
+    def lock(self, mask):
+        """Save the pieces of the boards on the occupancy array and erase the full rows of those boards.
+
+        Arguments:
+        mask -- B numpy bool array with the boards whose piece is saved
+        Return B numpy int array with the number of rows erased on each board
+        """
+        erased = np.zeros(self.size, dtype=np.int64)
+        boards = np.flatnonzero(mask)
+        if not len(boards):
+            return erased
+        table = self.table[self.shape[boards], self.rotation[boards]]
+        rows = table[:, :, 0] + self.row[boards, None]
+        columns = table[:, :, 1] + self.column[boards, None]
+        boards = np.broadcast_to(boards[:, None], rows.shape)
+        inside = (rows >= 0) & (rows < self.n) & (columns >= 0) & (columns < self.m)
+        boards, rows, columns = boards[inside], rows[inside], columns[inside]
+        # padded cells repeat a cell of the piece, so each (board, row, column) is counted once
+        cells = np.unique(np.stack([boards, rows, columns], axis=1), axis=0)
+        cells = cells[~self.occupancy[cells[:, 0], cells[:, 1], cells[:, 2]]]
+        self.occupancy[cells[:, 0], cells[:, 1], cells[:, 2]] = True
+        np.add.at(self.counts, (cells[:, 0], cells[:, 2]), 1)
+        # full rows of the boards that locked a piece
+        boards = np.flatnonzero(mask)
+        full = self.occupancy[boards].all(axis=2)
+        erased[boards] = full.sum(axis=1)
+        cleared = boards[erased[boards] > 0]
+        if len(cleared):
+            full = full[erased[boards] > 0]
+            # full rows go to the top, the kept rows keep their order below them, then the full rows are emptied
+            order = np.argsort(~full, axis=1, kind="stable")
+            rows = np.take_along_axis(self.occupancy[cleared], order[:, :, None], axis=1)
+            rows[np.arange(self.n)[None, :] < erased[cleared, None]] = False
+            self.occupancy[cleared] = rows
+            self.counts[cleared] -= erased[cleared, None]
+        return erased
+
+    def step(self, commands):
+        """Run one command on each board, as Game.step does for one game. A piece on the floor or touching another
+        piece is saved on the board and the board waits for a new piece.
+
+        Arguments:
+        commands -- list or numpy int array with one command code per board. E.g [DOWN, LEFT, NOOP]
+        Return dict with B numpy arrays: 'locked' True where the piece was saved, 'erased' with the number of rows
+        erased and 'over' True where the game ended on this step.
+        """
+        commands = np.asarray(commands)
+        playing = self.active & ~self.over
+        rows, columns = self.cells(self.rotation, self.row, self.column)
+        # verify if game over condition was reached
+        over = playing & self.full_column(rows, columns)
+        self.over |= over
+        playing &= ~over
+        # a piece on the floor is saved and the command is ignored
+        to_lock = playing & (rows == self.n - 1).any(axis=1)
+        moving = playing & ~to_lock & (commands != NOOP)
+
+        # "rotate" moves the piece down with its next rotation when the rotated cells are free
+        rotate = moving & (commands == ROTATE)
+        rotation = np.where(rotate, (self.rotation + 1) % self.rotations[self.shape], self.rotation)
+        rows, columns = self.cells(rotation, self.row + 1, self.column)
+        rotated = rotate & self.inside(rows, columns) & ~self.locked(rows, columns).any(axis=1)
+        self.rotation[rotated] = rotation[rotated]
+        self.row += rotated
+
+        # "left", "right", "down" and the rotations refused move the piece one row down, and one column when the
+        # grid walls allow it. A piece that touches another piece does not move and is saved
+        shift = moving & ~rotated & (commands != DROP)
+        move = np.where(commands == LEFT, -1, np.where(commands == RIGHT, 1, 0)) * shift
+        rows, columns = self.cells(self.rotation, self.row, self.column + move)
+        move *= self.inside(rows, columns)
+        rows, columns = self.cells(self.rotation, self.row + 1, self.column + move)
+        free = ~self.locked(rows, columns).any(axis=1)
+        self.row += shift & free
+        self.column += move * free
+        to_lock |= shift & ~free
+
+        # "drop" moves the piece down until it lands, then saves it
+        drop = moving & (commands == DROP)
+        self.row += self.drop_distance(drop)
+        to_lock |= drop
+
+        erased = self.lock(to_lock)
+        self.active &= ~to_lock & ~over
+        return {'locked': to_lock, 'erased': erased, 'over': over}
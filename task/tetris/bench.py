@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from board import Board
+from game import Piece, main as game_main
+from render import Grid
+from shapes import SHAPES
+
+# grid sizes and stack heights measured by default. The stack height is a fraction of the grid height
+SIZES = ((10, 20), (64, 20), (256, 20), (1024, 20))
+STACKS = (0.0, 0.5)
+# number of operations of each measure
+OPERATIONS = 2000
+
+
+def stacked_board(dimensions, stack, rng):
+    """Build a board with random locked cells on its bottom rows. Each row keeps a free cell, so no row is full.
+
+    Arguments:
+    dimensions -- list with int M and N grid dimensions
+    stack -- int with the number of bottom rows with locked cells
+    rng -- random.Random object used to choose the cells
+    Return Board object
+    """
+    board = Board(dimensions)
+    m, n = dimensions
+    for row in range(n - stack, n):
+        gap = rng.randrange(m)
+        board.lock([(row, column) for column in range(m) if column != gap and rng.random() < 0.7])
+    return board
+
+
+def generate_script(dimensions, pieces, seed):
+    """Build a script with random pieces and movements. The same seed gives the same script.
+
+    Arguments:
+    dimensions -- list with int M and N grid dimensions
+    pieces -- int with the number of pieces
+    seed -- int with the seed of the random choices
+    Return list with the lines of the script, the grid dimensions first and 'exit' last
+    """
+    rng = random.Random(seed)
+    shapes = sorted(SHAPES)
+    lines = [f"{dimensions[0]} {dimensions[1]}"]
+    for _ in range(pieces):
+        lines += ["piece", rng.choice(shapes)]
+        lines += [rng.choice(["left", "right", "down", "rotate"]) for _ in range(rng.randrange(dimensions[1] // 2))]
+        lines.append("drop")
+    lines.append("exit")
+    return lines
+
+
+def bench_move(dimensions, stack, rng):
+    """Move horizontal I pieces from the top of the board until they touch the stack, without a grid."""
+    board = stacked_board(dimensions, stack, rng)
+    moves = [rng.choice((-1, 0, 1)) for _ in range(OPERATIONS)]
+    piece = Piece("I", board)
+    piece.rotation = 1
+    elapsed = 0.0
+    for move in moves:
+        start = time.perf_counter()
+        go_vertical = piece.move(move)
+        elapsed += time.perf_counter() - start
+        if not go_vertical or piece.on_floor():
+            piece.row = 0
+    return elapsed, len(moves)
+
+
+def bench_rotate(dimensions, stack, rng):
+    """Rotate T pieces from the top of the board until they touch the stack, without a grid."""
+    board = stacked_board(dimensions, stack, rng)
+    piece = Piece("T", board)
+    elapsed = 0.0
+    for _ in range(OPERATIONS):
+        start = time.perf_counter()
+        go_vertical = piece.rotate()
+        elapsed += time.perf_counter() - start
+        if not go_vertical or piece.on_floor():
+            piece.row = piece.rotation = 0
+    return elapsed, OPERATIONS
+
+
+def bench_floor(dimensions, stack, rng):
+    """Verify if a piece on the top of the board is on the floor."""
+    piece = Piece("L", stacked_board(dimensions, stack, rng))
+    start = time.perf_counter()
+    for _ in range(OPERATIONS):
+        piece.floor()
+    return time.perf_counter() - start, OPERATIONS
+
+
+def bench_game_over(dimensions, stack, rng):
+    """Verify if a column is full, counting a piece on the top of the board."""
+    piece = Piece("L", stacked_board(dimensions, stack, rng))
+    start = time.perf_counter()
+    for _ in range(OPERATIONS):
+        piece.game_over()
+    return time.perf_counter() - start, OPERATIONS
+
+
+def bench_erase_row(dimensions, stack, rng):
+    """Erase four full rows from the top of the stack. The board is restored before each erase."""
+    m, n = dimensions
+    board = stacked_board(dimensions, stack, rng)
+    # the full rows are put over the stack, as low as the board allows
+    top = max(0, n - stack - 4)
+    board.lock([(row, column) for row in range(top, top + 4) for column in range(m)])
+    state = board.snapshot()
+    piece = Piece("I", board)
+    elapsed = 0.0
+    for _ in range(OPERATIONS // 10):
+        board.restore(state)
+        start = time.perf_counter()
+        piece.erase_row()
+        elapsed += time.perf_counter() - start
+    return elapsed, OPERATIONS // 10
+
+
+def bench_write_position(dimensions, stack, rng):
+    """Write a piece on the grid and print the frame to os.devnull."""
+    board = stacked_board(dimensions, stack, rng)
+    grid = Grid(dimensions)
+    grid.redraw(board)
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        piece = Piece("T", board, grid)
+        start = time.perf_counter()
+        for operation in range(OPERATIONS):
+            piece.row = operation % 2
+            piece.write_position()
+        elapsed = time.perf_counter() - start
+    return elapsed, OPERATIONS
+
+
+def bench_main(dimensions, stack, rng):
+    """Run main() with a generated script, printing every frame to os.devnull. The time is per command."""
+    lines = generate_script(dimensions, 50, rng.randrange(1 << 30))
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "script.txt")
+        with open(path, "w") as script:
+            script.write("\n".join(lines) + "\n")
+        argv = sys.argv
+        sys.argv = ["game.py", path]
+        try:
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                start = time.perf_counter()
+                game_main()
+                elapsed = time.perf_counter() - start
+        finally:
+            sys.argv = argv
+    return elapsed, len(lines) - 1
+
+
+# benchmarks by name. main runs from an empty board, so it is only measured without a stack
+BENCHMARKS = {"move": bench_move, "rotate": bench_rotate, "floor": bench_floor, "game_over": bench_game_over,
+              "erase_row": bench_erase_row, "write_position": bench_write_position, "main": bench_main}
+
+
+def run(names, sizes, stacks, repeat=5, seed=0):
+    """Measure the benchmarks on every grid size and stack height. Each measure is repeated and the fastest is kept.
+
+    Arguments:
+    names -- list with the names of the benchmarks on BENCHMARKS
+    sizes -- list with (M, N) grid dimensions
+    stacks -- list with the stack heights, as fractions of N
+    repeat -- int with the number of times each measure is repeated
+    seed -- int with the seed of the boards and scripts. The same seed gives the same boards and scripts
+    Return list with one dict per measure: 'name', 'width', 'height', 'stack' rows and 'seconds' per operation
+    """
+    results = []
+    for name in names:
+        for width, height in sizes:
+            for fraction in stacks:
+                stack = int(fraction * height)
+                if name == "main" and stack:
+                    continue
+                best = float("inf")
+                for _ in range(repeat):
+                    elapsed, operations = BENCHMARKS[name]([width, height], stack, random.Random(seed))
+                    best = min(best, elapsed / operations)
+                results.append({'name': name, 'width': width, 'height': height, 'stack': stack, 'seconds': best})
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Find the measures slower than the baseline.
+
+    Arguments:
+    results -- list with the dicts of run
+    baseline -- list with the dicts of a previous run
+    tolerance -- float with the fraction a measure may be slower than the baseline. E.g 0.2 for 20%
+    Return dict with the ratio of each measure to its baseline, by (name, width, height, stack), and list with the keys
+    of the measures slower than the tolerance
+    """
+    saved = {(item['name'], item['width'], item['height'], item['stack']): item['seconds'] for item in baseline}
+    ratios = {}
+    slower = []
+    for item in results:
+        key = (item['name'], item['width'], item['height'], item['stack'])
+        if key in saved and saved[key] > 0:
+            ratios[key] = item['seconds'] / saved[key]
+            if ratios[key] > 1 + tolerance:
+                slower.append(key)
+    return ratios, slower
+
+
+def parse_args(args=None):
+    """Read the command line options of the benchmarks.
+
+    Arguments:
+    args -- list with the command line arguments. None to read sys.argv
+    Return argparse.Namespace with the options
+    """
+    parser = argparse.ArgumentParser(description="Measure the cost of the Tetris engine operations.")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help="benchmarks run (default all)")
+    parser.add_argument("--sizes", nargs="+", default=[f"{m}x{n}" for m, n in SIZES],
+                        help="grid sizes MxN (default " + " ".join(f"{m}x{n}" for m, n in SIZES) + ")")
+    parser.add_argument("--stacks", nargs="+", type=float, default=list(STACKS),
+                        help="stack heights as fractions of the grid height (default 0 0.5)")
+    parser.add_argument("--repeat", type=int, default=5, help="times each measure is repeated (default 5)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the boards and scripts (default 0)")
+    parser.add_argument("--output", help="JSON file where the results are written")
+    parser.add_argument("--baseline", help="JSON file with the results of a previous run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="fraction a measure may be slower than the baseline (default 0.2)")
+    return parser.parse_args(args)
+
+
+def main():
+    """Print the cost of each engine operation, in microseconds, for every grid size and stack height. With a baseline,
+    the ratio to it is printed as well and the exit status is 1 when a measure is slower than the tolerance.
+
+    Example:
+    python bench.py --output results.json
+    python bench.py --baseline results.json --tolerance 0.2
+    """
+    options = parse_args()
+    sizes = [tuple(int(x) for x in size.split("x")) for size in options.sizes]
+    results = run(options.only, sizes, options.stacks, options.repeat, options.seed)
+    ratios, slower = {}, []
+    if options.baseline:
+        with open(options.baseline) as baseline:
+            ratios, slower = compare(results, json.load(baseline)['results'], options.tolerance)
+    print("name            size        stack      us/op   ratio")
+    for item in results:
+        key = (item['name'], item['width'], item['height'], item['stack'])
+        ratio = f"{ratios[key]:7.2f}" if key in ratios else "      -"
+        mark = " slower" if key in slower else ""
+        size = f"{item['width']}x{item['height']}"
+        print(f"{item['name']:15} {size:11} {item['stack']:5d} {item['seconds'] * 1e6:10.2f} {ratio}{mark}")
+    if options.output:
+        with open(options.output, "w") as output:
+            json.dump({'python': platform.python_version(), 'seed': options.seed, 'results': results}, output,
+                      indent=1)
+    if slower:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
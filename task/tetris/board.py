@@ -0,0 +1,185 @@
+import numpy as np
+
+
+def unpack_rows(rows, m):
+    """Build the matrix of locked cells of rows saved as bitmasks.
+
+    Arguments:
+    rows -- list with one int bitmask per row, as Board.rows. Bit c is set when the cell on column c is locked
+    m -- int with the M width of the grid
+    Return numpy bool array with one row per bitmask and M columns. True where the cell is locked.
+    """
+    width = (m + 7) // 8
+    packed = np.frombuffer(b"".join(row.to_bytes(width, "little") for row in rows), dtype=np.uint8)
+    return np.unpackbits(packed.reshape(len(rows), width), axis=1, bitorder="little")[:, :m].astype(bool)
+
+
+class Board:
+    """Board object that keeps the locked cells of the grid as one integer bitmask per row"""
+    def __init__(self, dimensions):
+        """The initializer for the class.
+
+        Arguments:
+        dimensions -- list with int M and N grid dimensions
+        """
+        # m width n height
+        self.m = dimensions[0]
+        self.n = dimensions[1]
+        # rows is a list with N ints. Bit c of rows[r] is set when the cell on row r and column c is locked
+        self.rows = [0] * self.n
+        # mask of a row with all the M columns filled
+        self.full_row = (1 << self.m) - 1
+        # counts has the number of locked cells of each column. A column is full when its count is N
+        self.counts = np.zeros(self.m, dtype=np.int64)
+        # heights has the height of the highest locked cell of each column. 0 for an empty column, N when the top
+        # row is locked. The top surface of column c is on row N - heights[c]
+        self.heights = np.zeros(self.m, dtype=np.int64)
+
+    def __repr__(self):
+        """Print of the board"""
+        return f"Board: {self.m}x{self.n}; Rows: {[bin(row) for row in self.rows]}"
+
+    def snapshot(self):
+        """Save the locked cells of the board. The rows are ints, which never change, so the snapshot shares them with
+        the board instead of copying them.
+
+        Return tuple with the rows, the counts and the heights of the board
+        """
+        return tuple(self.rows), tuple(self.counts.tolist()), tuple(self.heights.tolist())
+
+    def restore(self, state):
+        """Set the locked cells of the board to the ones of a snapshot of a board with the same dimensions.
+
+        Arguments:
+        state -- tuple returned by snapshot
+        """
+        rows, counts, heights = state
+        if len(rows) != self.n or len(counts) != self.m:
+            raise ValueError(f"Snapshot of a {len(counts)}x{len(rows)} board can't be restored on a {self.m}x{self.n} board")
+        self.rows = list(rows)
+        self.counts[:] = counts
+        self.heights[:] = heights
+
+    def occupancy(self):
+        """Build the matrix of locked cells of the board.
+
+        Return numpy bool array with N rows and M columns. True where the cell is locked.
+        """
+        return unpack_rows(self.rows, self.m)
+
+    def occupied(self, row, column):
+        """Verify if a cell of the board is locked. Cells outside the board are never locked.
+
+        Arguments:
+        row -- int with the row of the cell
+        column -- int with the column of the cell
+        Return boolean True if the cell is locked. False otherwise.
+        """
+        if 0 <= row < self.n and 0 <= column < self.m:
+            return bool(self.rows[row] >> column & 1)
+        return False
+
+    def collides(self, cells):
+        """Verify if any of the cells is locked on the board.
+
+        Arguments:
+        cells -- iterable with (row, column) tuples. E.g [(0, 4), (1, 4)]
+        Return boolean True if any cell is locked. False otherwise.
+        """
+        for row, column in cells:
+            if self.occupied(row, column):
+                return True
+        return False
+
+    def lock(self, cells):
+        """Lock the cells on the board. Locking a cell twice has no effect.
+
+        Arguments:
+        cells -- iterable with (row, column) tuples. E.g [(0, 4), (1, 4)]
+        """
+        for row, column in cells:
+            if 0 <= row < self.n and 0 <= column < self.m and not self.rows[row] >> column & 1:
+                self.rows[row] |= 1 << column
+                self.counts[column] += 1
+                self.heights[column] = max(self.heights[column], self.n - row)
+
+    def clear_rows(self):
+        """Erase every full row of the board, moving the rows above each of them down.
+
+        Return list with the indices of the rows erased, from top to bottom. E.g [7, 9]
+        """
+        erased = [row for row, bits in enumerate(self.rows) if bits == self.full_row]
+        if erased:
+            # the rows that are kept go to the bottom, in the same order, and empty rows fill the top
+            self.rows = [0] * len(erased) + [bits for bits in self.rows if bits != self.full_row]
+            # a full row has one cell on each column
+            self.counts -= len(erased)
+            self.update_heights()
+        return erased
+
+    def update_heights(self):
+        """Find the height of each column again, going down from the top row until every column has a locked cell."""
+        self.heights[:] = 0
+        # seen has the columns where a locked cell was already found
+        seen = 0
+        for row, bits in enumerate(self.rows):
+            new = bits & ~seen
+            while new:
+                # lowest bit of new is the next column found on this row
+                column = (new & -new).bit_length() - 1
+                self.heights[column] = self.n - row
+                new &= new - 1
+            seen |= bits
+            if seen == self.full_row:
+                break
+
+    def drop_distance(self, cells):
+        """Find how many rows the cells can move down before touching the floor or a locked cell.
+
+        Arguments:
+        cells -- iterable with (row, column) tuples of the falling piece. E.g [(0, 4), (1, 4)]
+        Return int with the number of rows
+        """
+        cells = list(cells)
+        distance = self.n
+        for row, column in cells:
+            surface = self.n - int(self.heights[column])
+            # a cell under the top surface of its column may have locked cells below it, so the rows are checked
+            # one by one
+            if row >= surface:
+                distance = 0
+                while self.fits([(cell_row + distance + 1, cell_column) for cell_row, cell_column in cells]):
+                    distance += 1
+                return distance
+            distance = min(distance, surface - row - 1)
+        return distance
+
+    def fits(self, cells):
+        """Verify if the cells are inside the board and none of them is locked.
+
+        Arguments:
+        cells -- iterable with (row, column) tuples. E.g [(0, 4), (1, 4)]
+        Return boolean True if every cell is free. False otherwise.
+        """
+        for row, column in cells:
+            if not (0 <= column < self.m and row < self.n) or self.occupied(row, column):
+                return False
+        return True
+
+    def full_column(self, cells=()):
+        """Verify if a column of the board is completely filled, counting the cells as if they were locked.
+
+        Arguments:
+        cells -- iterable with (row, column) tuples of the falling piece. E.g [(0, 4), (1, 4)]
+        Return boolean True if any column is completely filled. False otherwise.
+        """
+        if (self.counts == self.n).any():
+            return True
+        # cells of the piece that are not locked yet, counted by column
+        added = {}
+        for row, column in set(cells):
+            if 0 <= row < self.n and 0 <= column < self.m and not self.rows[row] >> column & 1:
+                added[column] = added.get(column, 0) + 1
+                if self.counts[column] + added[column] == self.n:
+                    return True
+        return False
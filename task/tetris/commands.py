@@ -0,0 +1,105 @@
+import codecs
+import io
+import os
+import sys
+
+# number of characters read from the input at once
+CHUNK_SIZE = 1 << 16
+
+
+def read_commands(stream, chunk_size=CHUNK_SIZE):
+    """Read the commands of a stream in large chunks, giving one command at a time.
+
+    Arguments:
+    stream -- text file object with one command per line
+    chunk_size -- int with the number of characters read at once
+    Return generator with the strings of the commands, without the line endings
+    """
+    return _split_lines(iter(lambda: stream.read(chunk_size), ""))
+
+
+def read_descriptor(fd, chunk_size=CHUNK_SIZE, encoding=None):
+    """Read the commands of a pipe, giving one command at a time. Each read returns the data already sent, up to
+    chunk_size bytes, instead of waiting for a full chunk, so a program that sends one command and waits for its frame
+    gets it. The standard output is flushed before each read for the same reason.
+
+    Arguments:
+    fd -- int with the file descriptor of the pipe. E.g sys.stdin.fileno()
+    chunk_size -- int with the largest number of bytes read at once
+    encoding -- string with the encoding of the input. None for the encoding of the standard input
+    Return generator with the strings of the commands, without the line endings
+    """
+    decoder = codecs.getincrementaldecoder(encoding or sys.stdin.encoding or "utf-8")()
+
+    def chunks():
+        while True:
+            sys.stdout.flush()
+            data = os.read(fd, chunk_size)
+            # a character split between two reads is kept by the decoder until the rest of it arrives
+            chunk = decoder.decode(data, final=not data)
+            if chunk:
+                yield chunk
+            if not data:
+                return
+
+    return _split_lines(chunks())
+
+
+def _split_lines(chunks):
+    """Split chunks of text into lines.
+
+    Arguments:
+    chunks -- iterable with strings of any length
+    Return generator with the lines, without the line endings
+    """
+    # rest keeps the end of the last chunk, a line that is not complete yet
+    rest = ""
+    for chunk in chunks:
+        lines = (rest + chunk).split("\n")
+        rest = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    if rest:
+        yield rest.rstrip("\r")
+
+
+def input_commands():
+    """Read the commands with input(), one line at a time, as the game is played on a terminal.
+
+    Return generator with the strings of the commands
+    """
+    while True:
+        try:
+            yield input()
+        except EOFError:
+            return
+
+
+def open_commands(path=None):
+    """Choose how the commands are read. A file is read in large chunks and a piped input as soon as the data arrives.
+    A terminal, or an input that is not a real file, is read line by line with input().
+
+    Arguments:
+    path -- string with the path of a file with the commands. None to read the standard input
+    Return generator with the strings of the commands
+    """
+    if path is not None:
+        return read_file(path)
+    try:
+        interactive = os.isatty(sys.stdin.fileno())
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        interactive = True
+    if interactive:
+        return input_commands()
+    return read_descriptor(sys.stdin.fileno())
+
+
+def read_file(path):
+    """Read the commands of a file in chunks, closing it at the end.
+
+    Arguments:
+    path -- string with the path of a file with the commands
+    Return generator with the strings of the commands
+    """
+    with open(path) as stream:
+        yield from read_commands(stream)
@@ -0,0 +1,91 @@
+import numpy as np
+from batch import DOWN, LEFT, RIGHT, ROTATE, DROP
+from game import Game
+from randomizer import Randomizer
+
+# command run by each action. The codes are the ones of BatchGame.step
+ACTIONS = {DOWN: "down", LEFT: "left", RIGHT: "right", ROTATE: "rotate", DROP: "drop"}
+
+
+class TetrisEnv:
+    """Environment for reinforcement learning, with the reset and step methods of Gym. The shapes come from a seeded
+    Randomizer and a new piece is created as soon as the last one is locked. The game ends when a column is full, as
+    in main(), or when a new piece is created over locked cells, since it would be locked again on every step.
+
+    The observation is a read-only N x M numpy bool array with the locked cells, True where a cell is locked. The same
+    array is returned by every call and it is updated in place, so it must be copied to be kept"""
+    def __init__(self, dimensions=(10, 20), mode="bag", over_reward=-1.0):
+        """The initializer for the class. reset must be called before the first step.
+
+        Arguments:
+        dimensions -- tuple with int M and N grid dimensions
+        mode -- string 'bag' or 'uniform', the mode of the Randomizer
+        over_reward -- float with the reward of the step that ends the game
+        """
+        self.dimensions = list(dimensions)
+        self.mode = mode
+        self.over_reward = over_reward
+        self.actions = sorted(ACTIONS)
+        self.game = None
+        # True when the game is over, by a full column or by a new piece over locked cells
+        self.done = False
+        # cells is the array written by the environment and observation the read-only view given to the agent
+        self.cells = np.zeros((self.dimensions[1], self.dimensions[0]), dtype=bool)
+        self.observation = self.cells.view()
+        self.observation.flags.writeable = False
+
+    def __repr__(self):
+        """Print of the environment"""
+        return f"TetrisEnv: {self.dimensions[0]}x{self.dimensions[1]}; Mode: {self.mode}; Game: {self.game is not None}"
+
+    def reset(self, seed=0):
+        """Start a new game with an empty board and its first piece.
+
+        Arguments:
+        seed -- int with the seed of the shapes. The same seed gives the same shapes
+        Return numpy bool array with the observation
+        """
+        self.game = Game(self.dimensions, randomizer=Randomizer(seed, self.mode))
+        self.game.step("piece")
+        self.done = False
+        self.cells[:] = False
+        return self.observation
+
+    def step(self, action):
+        """Run the command of an action on the game. A piece that is locked is replaced by the next one.
+
+        Arguments:
+        action -- int with one of DOWN, LEFT, RIGHT, ROTATE or DROP
+        Return tuple with the observation, the float reward, the boolean done, True when the game is over, and a dict
+        with the info of the step: 'locked' True if the piece was saved on the board, 'erased' list with the rows
+        erased, 'piece' tuple with the shape, rotation, row and column of the falling piece and 'next' with the
+        next shape
+        """
+        if self.game is None:
+            raise RuntimeError("reset must be called before step")
+        if action not in ACTIONS:
+            raise ValueError(f"Action {action} must be one of {self.actions}")
+        game = self.game
+        reward = 0.0
+        if self.done:
+            events = {'locked': False, 'erased': [], 'over': False}
+        else:
+            events = game.step(ACTIONS[action])
+        if events['locked']:
+            if events['erased']:
+                # the rows moved down, so the whole board is copied
+                np.copyto(self.cells, game.board.occupancy())
+            else:
+                for row, column in game.piece.cells():
+                    if 0 <= row < game.board.n and 0 <= column < game.board.m:
+                        self.cells[row, column] = True
+            reward += len(events['erased'])
+            game.step("piece")
+            events['over'] = game.board.collides(game.piece.cells())
+        if events['over']:
+            self.done = True
+            reward += self.over_reward
+        piece = game.piece
+        info = {'locked': events['locked'], 'erased': events['erased'],
+                'piece': (piece.shape, piece.rotation, piece.row, piece.column), 'next': game.preview(1)[0]}
+        return self.observation, reward, self.done, info
@@ -0,0 +1,124 @@
+import numpy as np
+from board import unpack_rows
+
+# Every function takes the locked cells of one board, a N x M numpy bool array as Board.occupancy, or of a batch of
+# boards, a B x N x M array as BatchGame.occupancy. Row 0 is the top of the grid. The results have one value per
+# board: a number for one board, or an array of B numbers for a batch
+
+
+def heights(occupancy):
+    """Find the height of each column: 0 for an empty column and N when the top row is locked.
+
+    Arguments:
+    occupancy -- numpy bool array with the locked cells of one board or of a batch of boards
+    Return numpy int array with the M heights of each board
+    """
+    n = occupancy.shape[-2]
+    top = occupancy.argmax(axis=-2)
+    return np.where(occupancy.any(axis=-2), n - top, 0)
+
+
+def holes(occupancy):
+    """Count the free cells that have a locked cell above them, on the same column.
+
+    Arguments:
+    occupancy -- numpy bool array with the locked cells of one board or of a batch of boards
+    Return int, or numpy int array for a batch, with the number of holes of each board
+    """
+    covered = np.logical_or.accumulate(occupancy, axis=-2)
+    return (covered & ~occupancy).sum(axis=(-2, -1))
+
+
+def bumpiness(occupancy, column_heights=None):
+    """Add the height differences of neighbour columns.
+
+    Arguments:
+    occupancy -- numpy bool array with the locked cells of one board or of a batch of boards
+    column_heights -- numpy int array returned by heights, when it was already found
+    Return int, or numpy int array for a batch, with the bumpiness of each board
+    """
+    column_heights = heights(occupancy) if column_heights is None else column_heights
+    return np.abs(np.diff(column_heights, axis=-1)).sum(axis=-1)
+
+
+def wells(occupancy, column_heights=None):
+    """Add the depths of the wells, the columns lower than both neighbours. The grid walls are as high as the grid.
+
+    Arguments:
+    occupancy -- numpy bool array with the locked cells of one board or of a batch of boards
+    column_heights -- numpy int array returned by heights, when it was already found
+    Return int, or numpy int array for a batch, with the sum of the well depths of each board
+    """
+    column_heights = heights(occupancy) if column_heights is None else column_heights
+    n = occupancy.shape[-2]
+    wall = np.full(column_heights.shape[:-1] + (1,), n)
+    padded = np.concatenate([wall, column_heights, wall], axis=-1)
+    depth = np.minimum(padded[..., :-2], padded[..., 2:]) - column_heights
+    return np.maximum(depth, 0).sum(axis=-1)
+
+
+def row_transitions(occupancy):
+    """Count the changes between locked and free cells along each row. The grid walls count as locked cells.
+
+    Arguments:
+    occupancy -- numpy bool array with the locked cells of one board or of a batch of boards
+    Return int, or numpy int array for a batch, with the number of row transitions of each board
+    """
+    wall = np.ones(occupancy.shape[:-1] + (1,), dtype=bool)
+    padded = np.concatenate([wall, occupancy, wall], axis=-1)
+    return (padded[..., 1:] != padded[..., :-1]).sum(axis=(-2, -1))
+
+
+def column_transitions(occupancy):
+    """Count the changes between locked and free cells along each column. The floor counts as locked cells.
+
+    Arguments:
+    occupancy -- numpy bool array with the locked cells of one board or of a batch of boards
+    Return int, or numpy int array for a batch, with the number of column transitions of each board
+    """
+    floor = np.ones(occupancy.shape[:-2] + (1, occupancy.shape[-1]), dtype=bool)
+    padded = np.concatenate([occupancy, floor], axis=-2)
+    return (padded[..., 1:, :] != padded[..., :-1, :]).sum(axis=(-2, -1))
+
+
+def nearly_full(occupancy, missing=1):
+    """Count the rows that are not full and have at most missing free cells.
+
+    Arguments:
+    occupancy -- numpy bool array with the locked cells of one board or of a batch of boards
+    missing -- int with the largest number of free cells of a nearly full row
+    Return int, or numpy int array for a batch, with the number of nearly full rows of each board
+    """
+    free = occupancy.shape[-1] - occupancy.sum(axis=-1)
+    return ((free > 0) & (free <= missing)).sum(axis=-1)
+
+
+def features(occupancy, missing=1):
+    """Find every feature of one board or of a batch of boards.
+
+    Arguments:
+    occupancy -- numpy bool array with the locked cells of one board or of a batch of boards
+    missing -- int with the largest number of free cells of a nearly full row
+    Return dict with 'heights', 'aggregate_height', 'max_height', 'holes', 'bumpiness', 'wells', 'row_transitions',
+    'column_transitions' and 'nearly_full'
+    """
+    column_heights = heights(occupancy)
+    return {'heights': column_heights, 'aggregate_height': column_heights.sum(axis=-1),
+            'max_height': column_heights.max(axis=-1), 'holes': holes(occupancy),
+            'bumpiness': bumpiness(occupancy, column_heights), 'wells': wells(occupancy, column_heights),
+            'row_transitions': row_transitions(occupancy), 'column_transitions': column_transitions(occupancy),
+            'nearly_full': nearly_full(occupancy, missing)}
+
+
+def stack_rows(boards, m):
+    """Build the batch of locked cells of boards saved as bitmask rows, e.g the 'rows' of the Search placements.
+
+    Arguments:
+    boards -- list with B lists of N int bitmasks, as Board.rows
+    m -- int with the M width of the grid
+    Return numpy bool array with B x N x M locked cells
+    """
+    if not boards:
+        return np.zeros((0, 0, m), dtype=bool)
+    n = len(boards[0])
+    return unpack_rows([bits for rows in boards for bits in rows], m).reshape(len(boards), n, m)
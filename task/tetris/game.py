@@ -1,346 +1,437 @@
-import numpy as np
-from collections import deque
+import argparse
+import cProfile
+import os
+import sys
+
+# the modules of the game are imported by name, as when game.py is run from its folder. The folder is added to the
+# path so they are found as well when the game is run as the module tetris.game, as the stage tests do
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from board import Board
+from commands import open_commands
+from instrument import Stats, TimedBoard, TimedGrid
+from randomizer import MODES, Randomizer
+from render import Grid
+from shapes import SHAPES, min_dimensions, spawn_column
+
+# columns added to the piece origin by each movement command
+MOVES = {"right": 1, "left": -1, "down": 0}
 
 class Piece:
-    """Piece object and related functionality"""
-    def __init__(self, dimensions, stored_pieces):
-        """The initializer for the class.
+    """Piece object and related functionality. It only keeps the shape, the rotation and the origin of the piece. The
+    cells come from the SHAPES registry and the locked cells from the Board shared by all the pieces"""
+    __slots__ = ("shape", "rotation", "row", "column", "visible", "board", "grid")
+
+    def __init__(self, shape, board, grid=None):
+        """The initializer for the class. The piece is created on the top of the grid and written on it.
 
         Arguments:
-        shape -- string with piece shape I, S, Z, L, J, O, T.
-        dimensions -- list with int M and N grid dimensions
+        shape -- string with piece shape I, S, Z, L, J, O, T or any other shape on the SHAPES registry.
+        board -- Board object with the locked cells of the grid
+        grid -- Grid object shared by all the pieces, with the symbols printed on each cell. None to print nothing
         """
-        # m width n height
-        self.m = dimensions[0]
-        self.n = dimensions[1]
-        # grid is a matrix array. M "row" arrays  with N "columns" filled with '-'
-        self.grid = np.array([['-'] * self.m] * self.n)
-        # rotation to be used on initial_position arrays on subclasses
+        self.shape = shape
+        # rotation to be used on the SHAPES array of the shape
         self.rotation = 0
-        self.stored_pieces = stored_pieces
+        # origin of the piece on the grid. The cells of the rotation are added to it
+        self.row = 0
+        self.column = spawn_column(board.m)
+        # False after 'break', when the piece is not written on the grid
+        self.visible = True
+        self.board = board
+        self.grid = grid
+        # update the grid after the piece is created
+        self.write_position()
+
+    def __repr__(self):
+        """Print of the piece"""
+        return f"Shape: {self.shape}; Rotation: {self.rotation}; Origin: {(self.row, self.column)}; np_positions: {self.np_positions}"
+
+    @property
+    def m(self):
+        """Int with the M width of the grid"""
+        return self.board.m
+
+    @property
+    def n(self):
+        """Int with the N height of the grid"""
+        return self.board.n
+
+    @property
+    def np_positions(self):
+        """Numpy array with the current position of the piece on the grid. E.g [4 14 24 34]"""
+        return self.positions(self.rotation, self.row, self.column)
+
+    def cells(self, rotation=None, row=None, column=None):
+        """Find the (row, column) cells of the piece. By default the current rotation and origin are used.
+
+        Arguments:
+        rotation -- int with the index of the rotation
+        row -- int with the row of the origin
+        column -- int with the column of the origin
+        Return list with (row, column) tuples. E.g [(0, 4), (1, 4), (2, 4), (3, 4)]
+        """
+        rotation = self.rotation if rotation is None else rotation
+        row = self.row if row is None else row
+        column = self.column if column is None else column
+        return [(cell_row + row, cell_column + column) for cell_row, cell_column in SHAPES[self.shape][rotation].tolist()]
+
+    def positions(self, rotation, row, column):
+        """Find the positions on the grid of the piece cells for a rotation and an origin.
+
+        Arguments:
+        rotation -- int with the index of the rotation
+        row -- int with the row of the origin
+        column -- int with the column of the origin
+        Return numpy array with the positions. E.g [4 14 24 34]
+        """
+        cells = SHAPES[self.shape][rotation]
+        return (cells[:, 0] + row) * self.m + cells[:, 1] + column
 
     def print_grid(self):
         """Print the MxN grid.
         """
-        # for each row, prints each column. self.m - 1 is used because the array index starts at 0
-        for row in self.grid:
-            for index, column in enumerate(row):
-                # if it is the end of the row, don't add blank space after the {column} and go to next line
-                if index == self.m - 1:
-                    print(f"{column}")
-                # else remains in line and add blank space to {column} content
-                else:
-                    print(f"{column} ", end="")
-        # this print is necessary to pass the question test
-        print()
-
-    def write_position(self, np_positions):
-        """Recreate the original grid with '-' and replace '-' for '0' where the piece is placed at the moment.
+        self.grid.print_grid()
+
+    def write_position(self, visible=True):
+        """Write the piece where it is placed at the moment on the grid, erasing it from where it was, and print it.
 
         Arguments:
-        np_positions - - numpy array with the current position of the piece on the grid.E.g[4 14 24 34]
+        visible -- boolean False to erase the piece from the grid without writing it again
         """
-        self.grid = np.array([['-'] * self.m] * self.n)
-        # write grid with saved pieces
-        if self.stored_pieces:
-            for position in self.stored_pieces:
-                row = position // 10
-                column = position % 10
-                try:
-                    self.grid[row][column] = 0
-                except IndexError:
-                    print(self.stored_pieces)
-                    print(f"row: {row}, column: {column}")
-        # write grid with np_positions
-        if len(np_positions) != 0:
-            for position in np_positions:
-                row = (position // 10) % self.n
-                column = position % 10
-                self.grid[row][column] = 0
+        self.visible = visible
+        if self.grid is None:
+            return
+        self.grid.draw_piece(self.cells() if visible else [], self.board)
         self.print_grid()
 
-    def move(self, np_positions, move=0):
-        """Add +1/-1/0 to positions numpy array, making it moves 'right'/'left'/'down'. Limit movement within grid walls.
-        Then, add +10 making it moves 'down'.
+    def inside(self, cells):
+        """Verify if the cells are within the grid walls and above the floor.
+
+        Arguments:
+        cells -- list with (row, column) tuples. E.g [(0, 4), (1, 4)]
+        Return boolean True if every cell is inside the grid. False otherwise.
+        """
+        for row, column in cells:
+            if not (0 <= column < self.m and row < self.n):
+                return False
+        return True
+
+    def shift(self, move=0):
+        """Move the piece +1/-1/0 columns and 1 row 'down', as move does, without writing it on the grid.
 
         Arguments:
-        np_positions -- numpy array with the current position of the piece on the grid. E.g [4 14 24 34]
         move -- int with +1 to right, -1 to left and 0 to down
-        Return the np_positions updated
+        Return boolean go_vertical, False if the piece touched another piece and did not move
         """
-        # update np_positions with the command move. Saves it as new_np_positions
-        new_np_positions = (np_positions + move)
-        # if go_horizontal is True, move is allowed
-        go_horizontal = True
-        # if go_vertical is True, piece movement down is allowed
-        go_vertical = True
-        # if any position in new_np_positions changes row after the move was added to np_positions, flag go_horizontal
-        # is set to False and new_np_positions is ignored
-        for index in range(len(np_positions)):
-            if new_np_positions[index] // 10 != np_positions[index] // 10:
-                go_horizontal = False
-
-        # if any position in new_np_positions matches a position in piece.stored_pieces, flag go_horizontal and
-        # go_vertical are set to False and new_np_positions is ignored
-        if self.stored_pieces:
-            for position in self.stored_pieces:
-                if position in new_np_positions + 10:
-                    go_horizontal = False
-                    go_vertical = False
-
-        if go_horizontal and go_vertical:
-            np_positions = (new_np_positions + 10)
-        elif not go_horizontal and go_vertical:
-            np_positions = (np_positions + 10)
+        # if the move takes any cell out of the grid walls, the piece only moves down
+        if move and not self.inside(self.cells(column=self.column + move)):
+            move = 0
+        # if any cell of the moved piece is locked on the board, the piece does not move
+        go_vertical = not self.board.collides(self.cells(row=self.row + 1, column=self.column + move))
+        if go_vertical:
+            self.row += 1
+            self.column += move
+        return go_vertical
+
+    def move(self, move=0):
+        """Move the piece +1/-1/0 columns, making it moves 'right'/'left'/'down'. Limit movement within grid walls.
+        Then, add 1 row making it moves 'down'.
 
+        Arguments:
+        move -- int with +1 to right, -1 to left and 0 to down
+        Return boolean go_vertical, False if the piece touched another piece and did not move
+        """
+        go_vertical = self.shift(move)
         # update the grid after the movement
-        self.write_position(np_positions)
-        return np_positions, go_vertical
-
+        self.write_position()
+        return go_vertical
 
-    def rotate(self, positions, movements):
-        """Movements has all piece movements made in the game. Using it as a queue, remake all the piece movements
-        (+1/-1/0) or 'right'/'left'/'down' to the rotated piece. Then, add +10 making it moves 'down' for each movement.
+    def slide(self, move, times):
+        """Run the same move several times and write the grid only once, at the end. Like the commands one by one,
+        the piece is saved on the board when it is on the floor or when it touches another piece, and the moves left
+        are ignored.
 
         Arguments:
-        positions -- list with initial position of the rotated piece on the grid. E.g [4, 14, 24, 34]
-        movements -- deque with ints: +1 to right, -1 to left and 0 to down
-        Return the np_positions updated
+        move -- int with +1 to right, -1 to left and 0 to down
+        times -- int with the number of moves
+        Return boolean True if the piece was saved on the board. False otherwise.
         """
-        np_positions = np.array(positions)
-        for movement in movements:
-            np_positions = (np_positions + movement)
-            np_positions = (np_positions + 10)
+        if move == 0:
+            # moving down, the landing row comes straight from the column heights of the board
+            distance = self.drop_distance()
+            self.row += min(times, distance)
+            locked = times > distance
+        else:
+            locked = False
+            for _ in range(times):
+                if self.on_floor() or not self.shift(move):
+                    locked = True
+                    break
         # update the grid after the movement
-        self.write_position(np_positions)
-        return np_positions
+        self.write_position()
+        if locked:
+            self.lock()
+        return locked
 
-    def floor(self, np_positions):
-        """Verify if piece achieved the floor of the grid.
+    def rotate(self):
+        """Rotate the piece to its next rotation and move it 'down'. The rotated cells are found from the origin of the
+        piece. If they are out of the grid walls or over locked cells, the piece is not rotated and only moves 'down'.
+
+        Return boolean go_vertical, False if the piece touched another piece and did not move
+        """
+        rotation = (self.rotation + 1) % len(SHAPES[self.shape])
+        cells = self.cells(rotation, self.row + 1)
+        if not self.inside(cells) or self.board.collides(cells):
+            return self.move()
+        self.rotation = rotation
+        self.row += 1
+        # update the grid after the movement
+        self.write_position()
+        return True
+
+    def lock(self):
+        """Save the cells of the piece on the board."""
+        self.board.lock(self.cells())
+
+    def floor(self):
+        """Verify if piece achieved the floor of the grid. If yes, the piece is saved on the board.
 
-        Arguments:
-        np_positions -- numpy array with the current position of the piece on the grid. E.g [4 14 24 34]
         Return boolean True if piece touched the floor. False otherwise
         """
         hit_floor = False
-        if (np_positions // 10 == self.n - 1).any():
+        if self.on_floor():
             hit_floor = True
-            self.stored_pieces = self.stored_pieces + deque(np_positions.tolist())
+            self.lock()
         return hit_floor
 
-    def erase_row(self):
-        """Verify if row must be erased and update grid accordingly.
+    def on_floor(self):
+        """Verify if any cell of the piece is on the last row of the grid.
 
-        Return boolean True if row was erased. False otherwise.
+        Return boolean True if the piece is on the floor. False otherwise
         """
-        test_width_sorted = deque(sorted(self.stored_pieces.copy()))
-        count_col = 0
-        last_row = self.n - 1
-        row_erased = False
-        while len(test_width_sorted) > 0:
-            i = test_width_sorted.pop()
-            if i // 10 == last_row:
-                count_col += 1
-                if count_col == self.m:
-                    np_test_width_sorted = np.array(test_width_sorted) + 10
-                    test_width_sorted = deque(np_test_width_sorted.tolist())
-                    count_col = 0
-                    row_erased = True
-            else:
-                break
-        if row_erased:
-            self.stored_pieces = deque(np_test_width_sorted.tolist())
-        return row_erased
+        return any(row == self.n - 1 for row, column in self.cells())
 
+    def drop_distance(self):
+        """Find how many rows the piece can move down before touching the floor or another piece.
 
-    def game_over(self, np_positions):
-        """Verify if a column of the grid was completely filled. If yes, it's game over.
-
-        Arguments:
-        np_positions -- numpy array with the current position of the piece on the grid. E.g [4 14 24 34]
-        Return boolean True if it's game over. False otherwise.
+        Return int with the number of rows
         """
-        test_height = self.stored_pieces.copy()
-        for position in np_positions:
-            test_height.append(position)
-        test_height_sorted = deque(sorted(test_height))
-        while True:
-            i = test_height_sorted.popleft()
-            increment = 10
-            count_row = 1
-            if i // 10 == 0:
-                while i + increment in test_height_sorted and count_row < self.n:
-                    increment += 10
-                    count_row += 1
-                if count_row == self.n:
-                    return True
-            else:
-                break
-        return False
+        return self.board.drop_distance(self.cells())
 
+    def erase_row(self):
+        """Verify if rows must be erased and update grid accordingly.
 
+        Return list with the indices of the rows erased, from top to bottom. Empty if no row was erased.
+        """
+        erased = self.board.clear_rows()
+        # the rows of the board moved down, so the grid is written again from the board
+        if erased and self.grid is not None:
+            self.grid.redraw(self.board)
+        return erased
 
-# There is no need to create one class for each piece shape at this moment of the project. I used that to pratice inheritance
-class I(Piece):
-    """I object and related functionality. It is a child class from Piece class"""
-    def __init__(self, dimensions, stored_pieces):
-        """The initializer for the class. Inherits the methods of Piece class and creates others.
+    def game_over(self):
+        """Verify if a column of the grid was completely filled. If yes, it's game over.
 
-        Arguments:
-        dimensions -- list with int M and N grid dimensions
+        Return boolean True if it's game over. False otherwise.
         """
-        super().__init__(dimensions, stored_pieces)
-        self.shape = "I"
-        # possible initial positions of the piece for each rotation on the grid
-        self.initial_positions = [[4, 14, 24, 34], [3, 4, 5, 6]]
-        # chooses an initial position based on the rotation. Index 0 is been used.
-        self.positions = self.initial_positions[self.rotation]
-        self.np_positions = np.array(self.positions)
-        # update the grid after the piece is created
-        self.write_position(self.np_positions)
-
-    def __repr__(self):
-        """Print of the piece"""
-        return f"Shape: {self.shape}; Initial positions: {self.initial_positions}; Rotation: {self.rotation}; np_positions: {self.np_positions}"
+        return self.board.full_column(self.cells())
 
 
-class S(Piece):
-    """S object and related functionality. It is a child class from Piece class"""
-    def __init__(self, dimensions, stored_pieces):
-        """The initializer for the class. Inherits the methods of Piece class and creates others.
+class Game:
+    """Game object that runs the commands read by main() on a board. Nothing is printed unless a grid is given"""
+    def __init__(self, dimensions, grid=None, board=None, randomizer=None):
+        """The initializer for the class.
 
         Arguments:
         dimensions -- list with int M and N grid dimensions
+        grid -- Grid object where each frame is written and printed. None to run the game without printing
+        board -- Board object with MxN dimensions where the game is played. None for a new empty board
+        randomizer -- Randomizer object that chooses the shape of each piece. None to read the shape after 'piece'
         """
-        super().__init__(dimensions, stored_pieces)
-        self.shape = "S"
-        # possible initial positions of the piece for each rotation on the grid
-        self.initial_positions = [[5, 4, 14, 13], [4, 14, 15, 25]]
-        # chooses an initial position based on the rotation. Index 0 is been used.
-        self.positions = self.initial_positions[self.rotation]
-        self.np_positions = np.array(self.positions)
-        # update the grid after the piece is created
-        self.write_position(self.np_positions)
-
-    def __repr__(self):
-        """Print of the piece"""
-        return f"Shape: {self.shape}; Initial positions: {self.initial_positions}; Rotation: {self.rotation}; np_positions: {self.np_positions}"
+        self.dimensions = dimensions
+        self.grid = grid
+        # board will save pieces that hit the floor or that touched other pieces
+        self.board = Board(dimensions) if board is None else board
+        # piece falling on the grid. None until the first 'piece' command
+        self.piece = None
+        # True when the last command was 'piece' and the next one is the shape
+        self.expect_shape = False
+        # True when a column of the grid was completely filled
+        self.over = False
+        # with a randomizer, 'piece' creates the next shape it deals and no shape is read
+        self.randomizer = randomizer
+
+    def spawn(self, shape):
+        """Create the piece with the shape. Unknown shapes are ignored and the last piece is kept.
 
+        Arguments:
+        shape -- string with piece shape I, S, Z, L, J, O, T or any other shape on the SHAPES registry.
+        """
+        if shape in SHAPES:
+            self.piece = Piece(shape, self.board, self.grid)
 
-class Z(Piece):
-    """Z object and related functionality. It is a child class from Piece class"""
-    def __init__(self, dimensions, stored_pieces):
-        """The initializer for the class. Inherits the methods of Piece class and creates others.
+    def preview(self, count=1):
+        """Show the shapes of the next pieces dealt by the randomizer, without creating them.
 
         Arguments:
-        dimensions -- list with int M and N grid dimensions
+        count -- int with the number of shapes shown
+        Return list with the names of the next shapes, the next one first. Empty when the game has no randomizer
         """
-        super().__init__(dimensions, stored_pieces)
-        self.shape = "Z"
-        # possible initial positions of the piece for each rotation on the grid
-        self.initial_positions = [[4, 5, 15, 16], [5, 15, 14, 24]]
-        # chooses an initial position based on the rotation. Index 0 is been used.
-        self.positions = self.initial_positions[self.rotation]
-        self.np_positions = np.array(self.positions)
-        # update the grid after the piece is created
-        self.write_position(self.np_positions)
+        if self.randomizer is None:
+            return []
+        return self.randomizer.preview(count)
 
-    def __repr__(self):
-        """Print of the piece"""
-        return f"Shape: {self.shape}; Initial positions: {self.initial_positions}; Rotation: {self.rotation}; np_positions: {self.np_positions}"
+    def snapshot(self):
+        """Save the state of the game, so it can be restored later or on another Game, e.g to undo commands or to try
+        other commands from the same state. The snapshot is made of tuples and ints and can be pickled.
 
+        Return tuple with the dimensions, the board state, the piece (shape, rotation, row, column, visible) or None,
+        the expect_shape and over flags, and the randomizer state or None
+        """
+        piece = self.piece
+        if piece is not None:
+            piece = (piece.shape, piece.rotation, piece.row, piece.column, piece.visible)
+        randomizer = None if self.randomizer is None else self.randomizer.snapshot()
+        return tuple(self.dimensions), self.board.snapshot(), piece, self.expect_shape, self.over, randomizer
 
-class L(Piece):
-    """L object and related functionality. It is a child class from Piece class"""
-    def __init__(self, dimensions, stored_pieces):
-        """The initializer for the class. Inherits the methods of Piece class and creates others.
+    def restore(self, snapshot):
+        """Set the game to the state of a snapshot of a game with the same dimensions. The grid, if any, is written
+        again but not printed.
 
         Arguments:
-        dimensions -- list with int M and N grid dimensions
+        snapshot -- tuple returned by snapshot
         """
-        super().__init__(dimensions, stored_pieces)
-        self.shape = "L"
-        # possible initial positions of the piece for each rotation on the grid
-        self.initial_positions = [[4, 14, 24, 25], [5, 15, 14, 13], [4, 5, 15, 25], [6, 5, 4, 14]]
-        # chooses an initial position based on the rotation. Index 0 is been used.
-        self.positions = self.initial_positions[self.rotation]
-        self.np_positions = np.array(self.positions)
-        # update the grid after the piece is created
-        self.write_position(self.np_positions)
-
-    def __repr__(self):
-        """Print of the piece"""
-        return f"Shape: {self.shape}; Initial positions: {self.initial_positions}; Rotation: {self.rotation}; np_positions: {self.np_positions}"
+        dimensions, board, piece, self.expect_shape, self.over, randomizer = snapshot
+        self.board.restore(board)
+        self.randomizer = None if randomizer is None else Randomizer.from_snapshot(randomizer)
+        self.piece = None
+        if piece is not None:
+            shape, rotation, row, column, visible = piece
+            self.piece = Piece(shape, self.board)
+            self.piece.rotation, self.piece.row, self.piece.column = rotation, row, column
+            self.piece.visible = visible
+            self.piece.grid = self.grid
+        if self.grid is not None:
+            self.grid.redraw(self.board)
+            if self.piece is not None and self.piece.visible:
+                self.grid.draw_piece(self.piece.cells(), self.board)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, grid=None):
+        """Create a game with the state of a snapshot.
 
+        Arguments:
+        snapshot -- tuple returned by snapshot
+        grid -- Grid object where each frame is written and printed. None to run the game without printing
+        Return Game object
+        """
+        game = cls(list(snapshot[0]), grid)
+        game.restore(snapshot)
+        return game
 
-class J(Piece):
-    """J object and related functionality. It is a child class from Piece class"""
-    def __init__(self, dimensions, stored_pieces):
-        """The initializer for the class. Inherits the methods of Piece class and creates others.
+    def step(self, command):
+        """Run one command of the game.
 
         Arguments:
-        dimensions -- list with int M and N grid dimensions
+        command -- string with one line of the game input. E.g 'piece', 'T', 'right', 'down', 'rotate', 'break', 'exit'
+        Return dict with the events of the command: 'locked' True if the piece was saved on the board, 'erased' list
+        with the indices of the rows erased, 'over' True if it's game over and 'exit' True if the game must stop.
         """
-        super().__init__(dimensions, stored_pieces)
-        self.shape = "J"
-        # possible initial positions of the piece for each rotation on the grid
-        self.initial_positions = [[5, 15, 25, 24], [15, 5, 4, 3], [5, 4, 14, 24], [4, 14, 15, 16]]
-        # chooses an initial position based on the rotation. Index 0 is been used.
-        self.positions = self.initial_positions[self.rotation]
-        self.np_positions = np.array(self.positions)
-        # update the grid after the piece is created
-        self.write_position(self.np_positions)
-
-    def __repr__(self):
-        """Print of the piece"""
-        return f"Shape: {self.shape}; Initial positions: {self.initial_positions}; Rotation: {self.rotation}; np_positions: {self.np_positions}"
+        events = {'locked': False, 'erased': [], 'over': False, 'exit': False}
+        piece = self.piece
+        if self.expect_shape:
+            self.expect_shape = False
+            self.spawn(command)
+            return events
+        # "down N", "left N" and "right N" run the move N times
+        words = command.split()
+        times = 1
+        if len(words) == 2 and words[0] in MOVES and words[1].isascii() and words[1].isdecimal():
+            command, times = words[0], int(words[1])
+        if command == "exit":
+            events['exit'] = True
+        elif command == "piece" and self.randomizer is not None:
+            self.spawn(self.randomizer.next())
+        elif command == "piece":
+            self.expect_shape = True
+        # the commands below need a piece on the grid
+        elif piece is None:
+            pass
+        elif command == "break":
+            piece.write_position(False)
 
+        # verify if game over condition was reached
+        elif piece.game_over():
+            piece.write_position()
+            self.over = True
+            events['over'] = True
+            events['exit'] = True
 
-class O(Piece):
-    """O object and related functionality. It is a child class from Piece class"""
+        # verify if piece achieved the floor. If yes, saves the piece position, ignore command, print the grid and
+        # verifies if row must be erased
+        elif piece.floor():
+            events['locked'] = True
+            piece.write_position()
+            events['erased'] = piece.erase_row()
+
+        # "drop" moves the piece down until it touches the floor or another piece, and "down N", "left N" and "right N"
+        # run N moves. The grid is written once
+        elif command == "drop" or (command in MOVES and times != 1):
+            if piece.slide(MOVES.get(command, 0), times if command in MOVES else self.board.n):
+                events['locked'] = True
+                events['erased'] = piece.erase_row()
+        # for "right", "left" and "down", move method is called with +1, -1 or 0. "rotate" moves the piece down as well
+        # go_vertical is a flag that if false means that a piece touched another and need to be saved. The rows it
+        # filled are erased
+        elif command in MOVES or command == "rotate":
+            go_vertical = piece.rotate() if command == "rotate" else piece.move(MOVES[command])
+            if not go_vertical:
+                piece.lock()
+                events['locked'] = True
+                events['erased'] = piece.erase_row()
+        return events
 
-    def __init__(self, dimensions, stored_pieces):
-        """The initializer for the class. Inherits the methods of Piece class and creates others.
+    def frame(self):
+        """Build the grid as it was on the last frame, with the locked cells and the piece where it was written.
 
-        Arguments:
-        dimensions -- list with int M and N grid dimensions
+        Return string with the frame, one line per row followed by a blank line
         """
-        super().__init__(dimensions, stored_pieces)
-        self.shape = "O"
-        # possible initial positions of the piece for each rotation on the grid
-        self.initial_positions = [[4, 14, 15, 5]]
-        # chooses an initial position based on the rotation. Index 0 is been used.
-        self.positions = self.initial_positions[self.rotation]
-        self.np_positions = np.array(self.positions)
-        # update the grid after the piece is created
-        self.write_position(self.np_positions)
+        grid = Grid(self.dimensions)
+        grid.redraw(self.board)
+        if self.piece is not None and self.piece.visible:
+            grid.draw_piece(self.piece.cells(), self.board)
+        return grid.frame()
 
-    def __repr__(self):
-        """Print of the piece"""
-        return f"Shape: {self.shape}; Initial positions: {self.initial_positions}; Rotation: {self.rotation}; np_positions: {self.np_positions}"
+    def print_board(self):
+        """Print the grid as it was on the last frame, with the locked cells and the piece where it was written."""
+        sys.stdout.write(self.frame())
 
 
-class T(Piece):
-    """T object and related functionality. It is a child class from Piece class"""
-    def __init__(self, dimensions, stored_pieces):
-        """The initializer for the class. Inherits the methods of Piece class and creates others.
+def parse_args(args=None):
+    """Read the command line options of the game.
 
-        Arguments:
-        dimensions -- list with int M and N grid dimensions
-        """
-        super().__init__(dimensions, stored_pieces)
-        self.shape = "T"
-        # possible initial positions of the piece for each rotation on the grid
-        self.initial_positions = [[4, 14, 24, 15], [4, 13, 14, 15], [5, 15, 25, 14], [4, 5, 6, 15]]
-        # chooses an initial position based on the rotation. Index 0 is been used.
-        self.positions = self.initial_positions[self.rotation]
-        self.np_positions = np.array(self.positions)
-        # update the grid after the piece is created
-        self.write_position(self.np_positions)
+    Arguments:
+    args -- list with the command line arguments. None to read sys.argv
+    Return argparse.Namespace with the options
+    """
+    parser = argparse.ArgumentParser(description="Tetris game. Commands are read from the input.")
+    parser.add_argument("script", nargs="?", default=None,
+                        help="file with the commands, one per line. The standard input is read when it is not given")
+    parser.add_argument("--print", dest="frames", choices=["all", "final", "over"], default="all",
+                        help="print the grid after every command (all), only when the game stops (final) or only "
+                             "on game over (over)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="choose the shape of each piece from the seed, so 'piece' is not followed by a shape")
+    parser.add_argument("--randomizer", choices=MODES, default="bag",
+                        help="with --seed, deal every shape once per bag (bag) or each shape independently (uniform)")
+    parser.add_argument("--stats", metavar="FILE", default=None,
+                        help="record the count and latency of each kind of command, collision check, lock, line clear "
+                             "and render, and write them as JSON on FILE when the game stops or on SIGUSR1")
+    parser.add_argument("--profile", metavar="FILE", default=None,
+                        help="run the game under cProfile and write the profile on FILE, to be read with pstats")
+    return parser.parse_args(args)
 
-    def __repr__(self):
-        """Print of the piece"""
-        return f"Shape: {self.shape}; Initial positions: {self.initial_positions}; Rotation: {self.rotation}; np_positions: {self.np_positions}"
 
 def main():
     """Input grid dimensions, piece shape and piece movements.
@@ -350,9 +441,15 @@ def main():
     After that, user input 'piece' followed by the Tetris piece shape. Shapes can be I, S, Z, L, J, O, T.
     Next inputs are the movements of the piece. Options are: right, left, down, rotate(to rotate the piece). After each
     movement input the piece moves down on the grid as well. The grid is displayed after each movement input.
+    'right N', 'left N' and 'down N' run the movement N times and 'drop' moves the piece down until it lands. The grid
+    is displayed once for them.
     If an entire row is occupied by pieces, the row disappears.
     If an entire column is occupied by pieces, it's game over.
     Input 'break' to stop and 'exit' to finish the game.
+    Run with --print final to print only the last grid, or --print over to print it only on game over.
+    The commands can also be read from a file, given as the first argument.
+    Run with --seed S to have the shapes chosen from the seed, with 'piece' alone creating the next piece.
+    Run with --stats FILE to save the latency of the commands, or --profile FILE to save a cProfile profile.
 
     Example:
     10 10
@@ -362,82 +459,65 @@ def main():
     down
     break
     """
+    options = parse_args()
+    if options.profile is None:
+        play(options)
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(play, options)
+    finally:
+        profiler.dump_stats(options.profile)
+
+
+def play(options):
+    """Play the game read from the script or the standard input, with the command line options of parse_args.
+
+    Arguments:
+    options -- argparse.Namespace with the options
+    """
+    # stats are only recorded when asked, so a normal game runs the engine without timers
+    stats = None
+    if options.stats is not None:
+        stats = Stats()
+        stats.dump_on_signal(options.stats)
+    # commands come from the script file, from a piped input read in chunks, or from the terminal line by line
+    commands = open_commands(options.script)
     # MxN grid dimensions
-    dimensions = [int(x) for x in input().split()]
-    # stored_pieces will save pieces that hit the floor or that touched other pieces
-    stored_pieces = deque()
+    line = next(commands, None)
+    if line is None:
+        return
+    try:
+        dimensions = [int(x) for x in line.split()]
+    except ValueError:
+        dimensions = []
+    # a piece created on a smaller grid would have cells outside it
+    min_m, min_n = min_dimensions()
+    if len(dimensions) != 2 or dimensions[0] < min_m or dimensions[1] < min_n:
+        print(f"Invalid grid dimensions: the grid must be M N, at least {min_m} {min_n}")
+        return
+    # the grid is only needed when every frame is printed
+    grid = None
+    if options.frames == "all":
+        grid = Grid(dimensions) if stats is None else TimedGrid(dimensions, stats)
+    randomizer = None if options.seed is None else Randomizer(options.seed, options.randomizer)
+    game = Game(dimensions, grid, None if stats is None else TimedBoard(dimensions, stats), randomizer)
     # display empty grid
-    empty_grid = Piece(dimensions, stored_pieces)
-    empty_grid.print_grid()
-    # calls the class method based on the movement
-    while True:
-        command = input()
-        if command == "exit":
-            break
-        elif command == "break":
-            piece.write_position([])
-        elif command == "piece":
-            shape = input()
-            # create the movements deque where the player movements will be stored for a given piece
-            movements = deque()
-            # based on shape creates the class instance. The variable with the instance is "piece"
-            if shape == 'I':
-                piece = I(dimensions, stored_pieces)
-            elif shape == 'S':
-                piece = S(dimensions, stored_pieces)
-            elif shape == 'Z':
-                piece = Z(dimensions, stored_pieces)
-            elif shape == 'L':
-                piece = L(dimensions, stored_pieces)
-            elif shape == 'J':
-                piece = J(dimensions, stored_pieces)
-            elif shape == 'O':
-                piece = O(dimensions, stored_pieces)
-            elif shape == 'T':
-                piece = T(dimensions, stored_pieces)
-
-        # verify if game over condition was reached
-        elif piece.game_over(piece.np_positions):
-            piece.write_position(piece.np_positions)
+    if grid is not None:
+        grid.print_grid()
+    try:
+        # runs the commands until 'exit', game over or the end of the input
+        for command in commands:
+            events = game.step(command) if stats is None else stats.step(game, command)
+            if events['exit']:
+                break
+        if options.frames == "final" or (options.frames == "over" and game.over):
+            game.print_board()
+        if game.over:
             print("Game Over!")
-            break
-
-        # verify if piece achieved the floor. If yes, saves the piece position, ignore command, print the grid and
-        # verifies if row must be erased
-        elif piece.floor(piece.np_positions):
-            stored_pieces = piece.stored_pieces.copy()
-            piece.write_position(piece.np_positions)
-            if piece.erase_row():
-                stored_pieces = piece.stored_pieces.copy()
-
-        # for "right", move method is called. +1 is sent to move and added to movements
-        # go_vertical is a flag that if false means that a piece touched another and need to be saved
-        elif command == "right":
-            piece.np_positions, go_vertical = piece.move(piece.np_positions, 1)
-            movements.append(1)
-            if not go_vertical:
-                piece.stored_pieces = piece.stored_pieces + deque(piece.np_positions.tolist())
-                stored_pieces = piece.stored_pieces.copy()
-        # for "left", move method is called. -1 is sent to move and added to movements
-        elif command == "left":
-            piece.np_positions, go_vertical = piece.move(piece.np_positions, -1)
-            movements.append(-1)
-            if not go_vertical:
-                piece.stored_pieces = piece.stored_pieces + deque(piece.np_positions.tolist())
-                stored_pieces = piece.stored_pieces.copy()
-        # for "down", move method is called. 0 is added to movements
-        elif command == "down":
-            piece.np_positions, go_vertical = piece.move(piece.np_positions)
-            movements.append(0)
-            if not go_vertical:
-                piece.stored_pieces = piece.stored_pieces + deque(piece.np_positions.tolist())
-                stored_pieces = piece.stored_pieces.copy()
-        # for "rotate", rotate method is called. 0 is added to movements
-        elif command == "rotate":
-            # shifts the initial_positions array when user wants to rotate the piece
-            piece.rotation = (piece.rotation + 1) % len(piece.initial_positions)
-            movements.append(0)
-            piece.np_positions = piece.rotate(piece.initial_positions[piece.rotation], movements)
+    finally:
+        if stats is not None:
+            stats.dump(options.stats)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,174 @@
+import json
+import signal
+import time
+from board import Board
+from render import Grid
+
+
+class Stats:
+    """Stats object with the number of calls and a latency histogram for each kind of command and for the engine work
+    done by them: collision checks, game over checks, locks, line clears and rendering"""
+    def __init__(self):
+        """The initializer for the class."""
+        # calls maps each name to [number of calls, total seconds, largest seconds, histogram]. Bucket b of the
+        # histogram counts the calls that took from 2^(b-1) to 2^b microseconds, and bucket 0 the ones under 1
+        self.calls = {}
+
+    def __repr__(self):
+        """Print of the stats"""
+        return f"Stats: {', '.join(f'{name} {calls[0]}' for name, calls in self.calls.items())}"
+
+    def record(self, name, seconds):
+        """Count one call and its latency.
+
+        Arguments:
+        name -- string with the kind of call. E.g 'command.rotate', 'line_clear'
+        seconds -- float with the time the call took
+        """
+        calls = self.calls.get(name)
+        if calls is None:
+            calls = self.calls[name] = [0, 0.0, 0.0, []]
+        calls[0] += 1
+        calls[1] += seconds
+        calls[2] = max(calls[2], seconds)
+        bucket = int(seconds * 1e6).bit_length()
+        histogram = calls[3]
+        if bucket >= len(histogram):
+            histogram.extend([0] * (bucket + 1 - len(histogram)))
+        histogram[bucket] += 1
+
+    def step(self, game, command):
+        """Run one command of a game and record its latency, by kind of command.
+
+        Arguments:
+        game -- Game object
+        command -- string with one line of the game input
+        Return dict with the events of Game.step
+        """
+        # the line after 'piece' is the shape, the other lines are named by their first word
+        kind = "shape" if game.expect_shape else (command.split() or [""])[0]
+        if kind != "shape" and kind not in ("piece", "right", "left", "down", "rotate", "drop", "break", "exit"):
+            kind = "other"
+        start = time.perf_counter()
+        events = game.step(command)
+        self.record("command." + kind, time.perf_counter() - start)
+        return events
+
+    def to_dict(self):
+        """Build the stats as they are written on JSON.
+
+        Return dict with one dict per name: 'count', 'total_us', 'mean_us', 'max_us' and 'histogram', a dict with the
+        number of calls under each limit. E.g {'<1us': 3, '<2us': 10, '<4us': 1}
+        """
+        stats = {}
+        for name, (count, total, largest, histogram) in sorted(self.calls.items()):
+            stats[name] = {'count': count, 'total_us': total * 1e6, 'mean_us': total * 1e6 / count,
+                           'max_us': largest * 1e6,
+                           'histogram': {f"<{1 << bucket}us": calls for bucket, calls in enumerate(histogram) if calls}}
+        return stats
+
+    def dump(self, path):
+        """Write the stats as JSON.
+
+        Arguments:
+        path -- string with the path of the JSON file
+        """
+        with open(path, "w") as output:
+            json.dump(self.to_dict(), output, indent=1)
+
+    def dump_on_signal(self, path, signum=getattr(signal, "SIGUSR1", None)):
+        """Write the stats as JSON every time the process gets the signal, so a long run can be inspected while it
+        plays. Does nothing on systems without the signal.
+
+        Arguments:
+        path -- string with the path of the JSON file
+        signum -- int with the signal. SIGUSR1 by default
+        """
+        if signum is not None:
+            signal.signal(signum, lambda received, frame: self.dump(path))
+
+
+class TimedBoard(Board):
+    """Board object that records the latency of collision checks, game over checks, locks and line clears on a
+    Stats object"""
+    def __init__(self, dimensions, stats):
+        """The initializer for the class.
+
+        Arguments:
+        dimensions -- list with int M and N grid dimensions
+        stats -- Stats object where the calls are recorded
+        """
+        super().__init__(dimensions)
+        self.stats = stats
+
+    def collides(self, cells):
+        """Board.collides, recorded as 'collision'"""
+        start = time.perf_counter()
+        collides = super().collides(cells)
+        self.stats.record("collision", time.perf_counter() - start)
+        return collides
+
+    def fits(self, cells):
+        """Board.fits, recorded as 'collision'"""
+        start = time.perf_counter()
+        fits = super().fits(cells)
+        self.stats.record("collision", time.perf_counter() - start)
+        return fits
+
+    def drop_distance(self, cells):
+        """Board.drop_distance, recorded as 'drop_distance'"""
+        start = time.perf_counter()
+        distance = super().drop_distance(cells)
+        self.stats.record("drop_distance", time.perf_counter() - start)
+        return distance
+
+    def full_column(self, cells=()):
+        """Board.full_column, recorded as 'game_over'"""
+        start = time.perf_counter()
+        full = super().full_column(cells)
+        self.stats.record("game_over", time.perf_counter() - start)
+        return full
+
+    def lock(self, cells):
+        """Board.lock, recorded as 'lock'"""
+        start = time.perf_counter()
+        super().lock(cells)
+        self.stats.record("lock", time.perf_counter() - start)
+
+    def clear_rows(self):
+        """Board.clear_rows, recorded as 'line_clear'"""
+        start = time.perf_counter()
+        erased = super().clear_rows()
+        self.stats.record("line_clear", time.perf_counter() - start)
+        return erased
+
+
+class TimedGrid(Grid):
+    """Grid object that records the latency of writing and printing the frames on a Stats object"""
+    def __init__(self, dimensions, stats):
+        """The initializer for the class.
+
+        Arguments:
+        dimensions -- list with int M and N grid dimensions
+        stats -- Stats object where the calls are recorded
+        """
+        super().__init__(dimensions)
+        self.stats = stats
+
+    def redraw(self, board):
+        """Grid.redraw, recorded as 'render.redraw'"""
+        start = time.perf_counter()
+        super().redraw(board)
+        self.stats.record("render.redraw", time.perf_counter() - start)
+
+    def draw_piece(self, cells, board):
+        """Grid.draw_piece, recorded as 'render.draw'"""
+        start = time.perf_counter()
+        super().draw_piece(cells, board)
+        self.stats.record("render.draw", time.perf_counter() - start)
+
+    def print_grid(self):
+        """Grid.print_grid, recorded as 'render.print'"""
+        start = time.perf_counter()
+        super().print_grid()
+        self.stats.record("render.print", time.perf_counter() - start)
@@ -0,0 +1,107 @@
+import random
+from collections import deque
+from shapes import SHAPES
+
+# ways of choosing the shapes. 'bag' deals every shape once, in a random order, before dealing them again. 'uniform'
+# chooses each shape independently
+MODES = ("bag", "uniform")
+
+
+class Randomizer:
+    """Randomizer object that chooses the shapes of the pieces from a seed. The same seed and mode always give the same
+    shapes. Shapes are chosen only when they are needed, by next or to fill the preview queue"""
+    def __init__(self, seed, mode="bag", shapes=None):
+        """The initializer for the class.
+
+        Arguments:
+        seed -- int with the seed of the random choices
+        mode -- string 'bag' for the 7-bag, where each bag has every shape once, or 'uniform'
+        shapes -- list with the names of the shapes dealt. None for every shape on the SHAPES registry
+        """
+        if mode not in MODES:
+            raise ValueError(f"Mode {mode} must be one of {', '.join(MODES)}")
+        self.seed = seed
+        self.mode = mode
+        self.shapes = list(SHAPES) if shapes is None else list(shapes)
+        self.random = random.Random(seed)
+        # queue has the shapes already chosen and not dealt yet, the next one first
+        self.queue = deque()
+        # bag has the shapes left on the current bag, in the order they are dealt
+        self.bag = []
+
+    def __repr__(self):
+        """Print of the randomizer"""
+        return f"Randomizer: {self.mode}; Seed: {self.seed}; Queue: {list(self.queue)}"
+
+    def __iter__(self):
+        """The randomizer is an endless iterator of shapes"""
+        return self
+
+    def __next__(self):
+        """Deal the next shape, as next does"""
+        return self.next()
+
+    def choose(self):
+        """Choose one more shape.
+
+        Return string with the name of the shape
+        """
+        if self.mode == "uniform":
+            return self.random.choice(self.shapes)
+        if not self.bag:
+            self.bag = self.shapes[:]
+            self.random.shuffle(self.bag)
+            # the last shape of the bag is dealt first
+            self.bag.reverse()
+        return self.bag.pop()
+
+    def next(self):
+        """Deal the next shape, the first one of the preview queue.
+
+        Return string with the name of the shape
+        """
+        if self.queue:
+            return self.queue.popleft()
+        return self.choose()
+
+    def preview(self, count):
+        """Show the next shapes without dealing them.
+
+        Arguments:
+        count -- int with the number of shapes shown
+        Return list with the names of the next shapes, the next one first
+        """
+        while len(self.queue) < count:
+            self.queue.append(self.choose())
+        return list(self.queue)[:count]
+
+    def snapshot(self):
+        """Save the state of the randomizer, so the same shapes are dealt again after restore.
+
+        Return tuple with the seed, the mode, the shapes, the state of the random generator, the queue and the bag
+        """
+        return self.seed, self.mode, tuple(self.shapes), self.random.getstate(), tuple(self.queue), tuple(self.bag)
+
+    def restore(self, state):
+        """Set the randomizer to the state of a snapshot.
+
+        Arguments:
+        state -- tuple returned by snapshot
+        """
+        self.seed, self.mode, shapes, random_state, queue, bag = state
+        self.shapes = list(shapes)
+        self.random.setstate(random_state)
+        self.queue = deque(queue)
+        self.bag = list(bag)
+
+    @classmethod
+    def from_snapshot(cls, state):
+        """Create a randomizer with the state of a snapshot.
+
+        Arguments:
+        state -- tuple returned by snapshot
+        Return Randomizer object
+        """
+        randomizer = cls(state[0], state[1], state[2])
+        randomizer.restore(state)
+        return randomizer
@@ -0,0 +1,64 @@
+import sys
+import numpy as np
+
+# byte printed for an empty cell
+EMPTY = ord('-')
+# byte printed for a cell with a piece
+FILLED = ord('0')
+
+
+class Grid:
+    """Grid object with the bytes printed for each cell. It is kept between frames and only the changed cells are
+    written"""
+    def __init__(self, dimensions):
+        """The initializer for the class.
+
+        Arguments:
+        dimensions -- list with int M and N grid dimensions
+        """
+        # m width n height
+        self.m = dimensions[0]
+        self.n = dimensions[1]
+        # buffer is a N x 2M uint8 array with the bytes of the printed frame. Cell (row, column) is buffer[row, 2 * column]
+        # and it is followed by a blank space, or by a new line on the last column
+        self.buffer = np.full((self.n, 2 * self.m), ord(' '), dtype=np.uint8)
+        self.buffer[:, -1] = ord('\n')
+        self.cells = self.buffer[:, ::2]
+        self.cells[:] = EMPTY
+        # (row, column) cells where the falling piece was written on the last frame
+        self.active = []
+
+    def redraw(self, board):
+        """Recreate the grid from the locked cells of the board. Used when the rows of the board were moved.
+
+        Arguments:
+        board -- Board object with the locked cells of the grid
+        """
+        self.cells[:] = np.where(board.occupancy(), FILLED, EMPTY)
+        self.active = []
+
+    def draw_piece(self, cells, board):
+        """Erase the falling piece from its last cells and write it on the new ones. Locked cells are kept.
+
+        Arguments:
+        cells -- list with (row, column) tuples of the falling piece. E.g [(0, 4), (1, 4)]
+        board -- Board object with the locked cells of the grid
+        """
+        for row, column in self.active:
+            if not board.occupied(row, column):
+                self.cells[row, column] = EMPTY
+        for row, column in cells:
+            self.cells[row, column] = FILLED
+        self.active = cells
+
+    def frame(self):
+        """Build the text of the MxN grid, followed by the blank line that separates the frames.
+
+        Return string with the frame
+        """
+        return self.buffer.tobytes().decode('ascii') + '\n'
+
+    def print_grid(self):
+        """Print the MxN grid with a single write.
+        """
+        sys.stdout.write(self.frame())
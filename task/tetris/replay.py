@@ -0,0 +1,328 @@
+import argparse
+import struct
+import sys
+from commands import open_commands
+from game import Game, Piece
+from randomizer import MODES, Randomizer
+from shapes import SHAPES
+
+# first bytes of every replay file
+MAGIC = b"TTRP"
+VERSION = 2
+# magic, version, M, N, seed, randomizer mode, keyframe interval, number of commands, size of the commands in bytes,
+# number of shapes. The mode is 0 when the shapes are read from the script, or 1 plus the index of the mode on MODES
+HEADER = struct.Struct("<4sBHHqBHIIB")
+# command index, offset of the next command, flags, shape index, rotation, row and column of the piece. The rows of
+# the board follow it, as little endian bitmasks
+KEYFRAME = struct.Struct("<IIBBBhh")
+# state of the randomizer, after the rows when the game has one: the 625 words of the Mersenne Twister, whether the
+# gauss_next of random.Random is set and its value, and the number of shapes on the bag and on the queue. The bag and
+# the queue follow it, one shape index per byte, on as many bytes each as there are shapes
+RANDOMIZER = struct.Struct("<625IBdBB")
+# flags of a keyframe
+EXPECT_SHAPE = 1
+OVER = 2
+HAS_PIECE = 4
+VISIBLE = 8
+
+# one byte per command. Lines the game ignores are saved as UNKNOWN and read back as an empty line
+UNKNOWN = 0
+OPCODES = {"piece": 1, "right": 2, "left": 3, "down": 4, "rotate": 5, "drop": 6, "break": 7, "exit": 8}
+# 'right N', 'left N' and 'down N' are one byte followed by N as a varint
+REPEATS = {"right": 9, "left": 10, "down": 11}
+# the shape read after 'piece' is SHAPE plus the index of the shape on the header
+SHAPE = 16
+NAMES = {code: command for command, code in OPCODES.items()}
+REPEAT_NAMES = {code: command for command, code in REPEATS.items()}
+
+
+def encode(command, shape_ids):
+    """Convert one command to the bytes of a replay.
+
+    Arguments:
+    command -- string with one line of the game input. E.g 'T', 'right', 'down 3'
+    shape_ids -- dict with the index of each shape name on the header
+    Return bytes with the command
+    """
+    if command in OPCODES:
+        return bytes([OPCODES[command]])
+    if command in shape_ids:
+        return bytes([SHAPE + shape_ids[command]])
+    words = command.split()
+    if len(words) == 2 and words[0] in REPEATS and words[1].isascii() and words[1].isdecimal():
+        code = bytearray([REPEATS[words[0]]])
+        times = int(words[1])
+        # 7 bits of N per byte, the high bit set on every byte but the last
+        while times >= 0x80:
+            code.append(times & 0x7F | 0x80)
+            times >>= 7
+        code.append(times)
+        return bytes(code)
+    return bytes([UNKNOWN])
+
+
+def decode(data, offset, shapes):
+    """Read one command of a replay.
+
+    Arguments:
+    data -- bytes of the replay file
+    offset -- int with the position of the command on data
+    shapes -- list with the shape names of the header
+    Return tuple with the string of the command and the int offset of the next command
+    """
+    code = data[offset]
+    offset += 1
+    if code in NAMES:
+        return NAMES[code], offset
+    if code >= SHAPE:
+        return shapes[code - SHAPE], offset
+    if code in REPEAT_NAMES:
+        times = shift = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            times |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        return f"{REPEAT_NAMES[code]} {times}", offset
+    return "", offset
+
+
+def pack_state(game, index, offset, shape_ids):
+    """Build the keyframe of a game, with the board as packed bitmasks, the state of the piece and the state of the
+    randomizer, when the game has one.
+
+    Arguments:
+    game -- Game object
+    index -- int with the number of commands run by the game
+    offset -- int with the offset of the next command on the commands section
+    shape_ids -- dict with the index of each shape name on the header
+    Return bytes with the keyframe
+    """
+    piece = game.piece
+    flags = EXPECT_SHAPE * game.expect_shape | OVER * game.over
+    shape = rotation = row = column = 0
+    if piece is not None:
+        flags |= HAS_PIECE | VISIBLE * piece.visible
+        shape, rotation, row, column = shape_ids[piece.shape], piece.rotation, piece.row, piece.column
+    width = (game.board.m + 7) // 8
+    rows = b"".join(bits.to_bytes(width, "little") for bits in game.board.rows)
+    state = KEYFRAME.pack(index, offset, flags, shape, rotation, row, column) + rows
+    if game.randomizer is None:
+        return state
+    randomizer = game.randomizer
+    slots = len(shape_ids)
+    if len(randomizer.queue) > slots:
+        raise ValueError(f"A preview queue of {len(randomizer.queue)} shapes can't be saved, the most is {slots}")
+    version, words, gauss = randomizer.random.getstate()
+    bag = bytes(shape_ids[name] for name in randomizer.bag).ljust(slots, b"\0")
+    queue = bytes(shape_ids[name] for name in randomizer.queue).ljust(slots, b"\0")
+    return state + RANDOMIZER.pack(*words, gauss is not None, gauss or 0.0, len(randomizer.bag),
+                                   len(randomizer.queue)) + bag + queue
+
+
+def unpack_state(data, offset, dimensions, shapes, seed=None, mode=None):
+    """Build the game saved on a keyframe.
+
+    Arguments:
+    data -- bytes of the replay file
+    offset -- int with the position of the keyframe on data
+    dimensions -- list with int M and N grid dimensions
+    shapes -- list with the shape names of the header
+    seed -- int with the seed of the randomizer of the game. None when the shapes are read from the script
+    mode -- string with the mode of the randomizer
+    Return tuple with the Game object, the int number of commands it ran and the int offset of the next command
+    """
+    index, command_offset, flags, shape, rotation, row, column = KEYFRAME.unpack_from(data, offset)
+    game = Game(dimensions)
+    board = game.board
+    width = (board.m + 7) // 8
+    start = offset + KEYFRAME.size
+    board.rows = [int.from_bytes(data[start + r * width:start + (r + 1) * width], "little") for r in range(board.n)]
+    if seed is not None:
+        start += board.n * width
+        *words, has_gauss, gauss, bag, queue = RANDOMIZER.unpack_from(data, start)
+        start += RANDOMIZER.size
+        slots = len(shapes)
+        bag = [shapes[code] for code in data[start:start + bag]]
+        queue = [shapes[code] for code in data[start + slots:start + slots + queue]]
+        game.randomizer = Randomizer.from_snapshot((seed, mode, tuple(shapes), (3, tuple(words),
+                                                    gauss if has_gauss else None), tuple(queue), tuple(bag)))
+    board.counts[:] = board.occupancy().sum(axis=0)
+    board.update_heights()
+    game.expect_shape = bool(flags & EXPECT_SHAPE)
+    game.over = bool(flags & OVER)
+    if flags & HAS_PIECE:
+        piece = Piece(shapes[shape], board)
+        piece.rotation, piece.row, piece.column = rotation, row, column
+        piece.visible = bool(flags & VISIBLE)
+        game.piece = piece
+    return game, index, command_offset
+
+
+def convert(lines, path, interval=256, seed=None, mode="bag"):
+    """Play a script and save it as a replay file, with a keyframe every interval commands. The commands after 'exit'
+    or game over are not saved, as main() does not read them.
+
+    Arguments:
+    lines -- iterable with the lines of the script, the grid dimensions first
+    path -- string with the path of the replay file
+    interval -- int with the number of commands between two keyframes
+    seed -- int with the seed of the shapes, as main() --seed. None when 'piece' is followed by the shape
+    mode -- string 'bag' or 'uniform', the mode of the randomizer when there is a seed
+    Return int with the number of commands saved
+    """
+    lines = iter(lines)
+    line = next(lines, None)
+    if line is None:
+        raise ValueError("The script has no grid dimensions")
+    dimensions = [int(x) for x in line.split()]
+    shapes = list(SHAPES)
+    shape_ids = {name: index for index, name in enumerate(shapes)}
+    game = Game(dimensions, randomizer=None if seed is None else Randomizer(seed, mode, shapes))
+    commands = bytearray()
+    keyframes = [pack_state(game, 0, 0, shape_ids)]
+    count = 0
+    for command in lines:
+        commands += encode(command, shape_ids)
+        count += 1
+        stop = game.step(command)['exit']
+        if count % interval == 0:
+            keyframes.append(pack_state(game, count, len(commands), shape_ids))
+        if stop:
+            break
+    names = b"".join(bytes([len(name)]) + name.encode("ascii") for name in shapes)
+    header = HEADER.pack(MAGIC, VERSION, dimensions[0], dimensions[1], 0 if seed is None else seed,
+                         0 if seed is None else MODES.index(mode) + 1, interval, count, len(commands), len(shapes))
+    with open(path, "wb") as replay:
+        replay.write(header + names + commands + b"".join(keyframes))
+    return count
+
+
+class Replay:
+    """Replay object that reads a replay file. Any frame is built from the keyframe before it, without playing the
+    game from the start"""
+    def __init__(self, path):
+        """The initializer for the class.
+
+        Arguments:
+        path -- string with the path of the replay file
+        """
+        with open(path, "rb") as replay:
+            self.data = replay.read()
+        magic, version, m, n, seed, mode, self.interval, self.count, size, shapes = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a replay file of version {VERSION}")
+        self.dimensions = [m, n]
+        # seed and mode of the randomizer. None when the shapes are read from the commands
+        self.seed = None if mode == 0 else seed
+        self.mode = None if mode == 0 else MODES[mode - 1]
+        # shape names, in the order of their index on the commands
+        self.shapes = []
+        offset = HEADER.size
+        for _ in range(shapes):
+            length = self.data[offset]
+            self.shapes.append(self.data[offset + 1:offset + 1 + length].decode("ascii"))
+            offset += 1 + length
+        # start of the commands and of the keyframes on the data
+        self.commands_offset = offset
+        self.keyframes_offset = offset + size
+        self.keyframe_size = KEYFRAME.size + n * ((m + 7) // 8)
+        if self.seed is not None:
+            self.keyframe_size += RANDOMIZER.size + 2 * shapes
+
+    def __repr__(self):
+        """Print of the replay"""
+        return f"Replay: {self.dimensions[0]}x{self.dimensions[1]}; Commands: {self.count}; Seed: {self.seed}"
+
+    def __len__(self):
+        """Number of commands of the replay"""
+        return self.count
+
+    def commands(self, start=0, offset=0):
+        """Read the commands of the replay.
+
+        Arguments:
+        start -- int with the index of the first command read
+        offset -- int with the offset of that command on the commands section. Only 0 is valid when start is 0
+        Return generator with the strings of the commands
+        """
+        offset += self.commands_offset
+        for _ in range(start, self.count):
+            command, offset = decode(self.data, offset, self.shapes)
+            yield command
+
+    def seek(self, frame):
+        """Build the game as it was after a number of commands, from the keyframe before it.
+
+        Arguments:
+        frame -- int with the number of commands run, from 0 to the number of commands of the replay
+        Return Game object without a grid
+        """
+        if not 0 <= frame <= self.count:
+            raise IndexError(f"Frame {frame} is out of the replay, it has {self.count} commands")
+        offset = self.keyframes_offset + frame // self.interval * self.keyframe_size
+        game, index, command_offset = unpack_state(self.data, offset, self.dimensions, self.shapes, self.seed,
+                                                   self.mode)
+        commands = self.commands(index, command_offset)
+        for _ in range(frame - index):
+            game.step(next(commands))
+        return game
+
+    def frame(self, frame):
+        """Build the grid as it was printed after a number of commands.
+
+        Arguments:
+        frame -- int with the number of commands run
+        Return string with the frame
+        """
+        return self.seek(frame).frame()
+
+
+def parse_args(args=None):
+    """Read the command line options of the replay tool.
+
+    Arguments:
+    args -- list with the command line arguments. None to read sys.argv
+    Return argparse.Namespace with the options
+    """
+    parser = argparse.ArgumentParser(description="Convert Tetris scripts to replay files and show their frames.")
+    actions = parser.add_subparsers(dest="action", required=True)
+    to_replay = actions.add_parser("convert", help="save a script as a replay file")
+    to_replay.add_argument("script", nargs="?", default=None,
+                           help="file with the commands, one per line. The standard input is read when it is not given")
+    to_replay.add_argument("-o", "--output", required=True, help="replay file written")
+    to_replay.add_argument("--interval", type=int, default=256,
+                           help="number of commands between two keyframes (default 256)")
+    to_replay.add_argument("--seed", type=int, default=None,
+                           help="seed of the shapes, for a script played with game.py --seed")
+    to_replay.add_argument("--randomizer", choices=MODES, default="bag",
+                           help="with --seed, deal every shape once per bag (bag) or each shape independently (uniform)")
+    show = actions.add_parser("show", help="print the grid after a number of commands of a replay file")
+    show.add_argument("replay", help="replay file read")
+    show.add_argument("frame", type=int, nargs="?", default=None,
+                      help="number of commands run. The last frame is printed when it is not given")
+    return parser.parse_args(args)
+
+
+def main():
+    """Convert a script to a replay file, or print one frame of a replay file.
+
+    Example:
+    python replay.py convert script.txt -o game.rpl
+    python replay.py show game.rpl 100
+    """
+    options = parse_args()
+    if options.action == "convert":
+        count = convert(open_commands(options.script), options.output, options.interval, options.seed,
+                        options.randomizer)
+        print(f"{count} commands saved on {options.output}")
+    else:
+        replay = Replay(options.replay)
+        frame = len(replay) if options.frame is None else options.frame
+        sys.stdout.write(replay.frame(frame))
+
+
+if __name__ == '__main__':
+    main()
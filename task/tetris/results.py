@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+VERSION = 3
+# one record per game. The script id is saved as UTF-8 on the scripts file, from 'script_start' and of 'script_size'
+# bytes, and 'script_hash' is the hash of the id kept on the script index. 'lock_start' and 'lock_count' are the
+# range of its locks on the locks file and 'board_start' the offset of its final board on the boards file, saved as N
+# little endian bitmasks of (M + 7) // 8 bytes, as Board.rows
+RECORD = np.dtype([('script_start', '<i8'), ('script_size', '<i4'), ('script_hash', '<u8'), ('seed', '<i8'),
+                   ('m', '<i4'), ('n', '<i4'), ('lines', '<i8'), ('pieces', '<i8'), ('over', '?'),
+                   ('lock_start', '<i8'), ('lock_count', '<i8'), ('board_start', '<i8')])
+# one record per lock: the index of the shape on the 'shapes' of the store, the rotation and the origin of the piece.
+# The origin is as wide as the grid dimensions of RECORD
+LOCK = np.dtype([('shape', '<u2'), ('rotation', '<u2'), ('row', '<i4'), ('column', '<i4')])
+# files of a store directory
+META = "meta.json"
+RECORDS = "records.bin"
+LOCKS = "locks.bin"
+BOARDS = "boards.bin"
+SCRIPTS = "scripts.bin"
+# fields with a sorted index, to find the records of a seed or of a script id. The index of a field is saved as its
+# values sorted, on <name>.npy, and the positions of the records in that order, on <name>_pos.npy
+INDEXED = {'seed': 'seed', 'script': 'script_hash'}
+
+
+def script_hash(script):
+    """Find the hash of a script id, the key of the script index. Different ids may have the same hash, so the ids of
+    the records found must still be compared.
+
+    Arguments:
+    script -- string with the id of the script
+    Return int with the 64 bits hash
+    """
+    return int.from_bytes(hashlib.blake2b(script.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def pack(values, dtype):
+    """Build the records of a file of the store.
+
+    Arguments:
+    values -- list with one tuple of field values per record
+    dtype -- numpy dtype of the records, RECORD or LOCK
+    Return numpy array with the records
+    Raise ValueError when a value does not fit its field
+    """
+    try:
+        return np.array(values, dtype=dtype)
+    except OverflowError as error:
+        raise ValueError(f"{error}, it does not fit the store") from error
+
+
+class ResultsWriter:
+    """ResultsWriter object that saves finished games on a new store directory, one fixed size record per game. The
+    index is written on close"""
+    def __init__(self, path, shapes):
+        """The initializer for the class. The directory is created, and the files of a store already there are
+        replaced.
+
+        Arguments:
+        path -- string with the path of the store directory
+        shapes -- list with the shape names, the index of each one is saved on the locks
+        """
+        self.path = path
+        self.shapes = list(shapes)
+        self.shape_ids = {name: index for index, name in enumerate(self.shapes)}
+        self.count = 0
+        self.lock_count = 0
+        self.board_bytes = 0
+        self.script_bytes = 0
+        os.makedirs(path, exist_ok=True)
+        self.records = open(os.path.join(path, RECORDS), "wb")
+        self.locks = open(os.path.join(path, LOCKS), "wb")
+        self.boards = open(os.path.join(path, BOARDS), "wb")
+        self.scripts = open(os.path.join(path, SCRIPTS), "wb")
+
+    def __repr__(self):
+        """Print of the writer"""
+        return f"ResultsWriter: {self.path}; Records: {self.count}; Locks: {self.lock_count}"
+
+    def add(self, script, dimensions, rows, lines, pieces, over, locks=(), seed=-1):
+        """Save the result of one game.
+
+        Arguments:
+        script -- string with the id of the script, e.g its path
+        dimensions -- list with int M and N grid dimensions of the game
+        rows -- list with N int bitmasks of the final board, as Board.rows
+        lines -- int with the number of rows erased
+        pieces -- int with the number of pieces created
+        over -- boolean True if the game ended by game over
+        locks -- list with one (shape, rotation, row, column) tuple per place where a piece was locked, in order
+        seed -- int with the seed of the shapes, not negative. -1 when the shapes came from the script
+        Raise ValueError when the game can't be saved. Nothing is written then, so the store stays valid
+        """
+        m, n = dimensions
+        if len(rows) != n or any(bits >> m for bits in rows):
+            raise ValueError(f"Board of {len(rows)} rows or wider than {m} columns is not a {m}x{n} board")
+        width = (m + 7) // 8
+        board = b"".join(bits.to_bytes(width, "little") for bits in rows)
+        name = script.encode("utf-8")
+        record = pack([(self.script_bytes, len(name), script_hash(script), seed, m, n, lines, pieces, over,
+                        self.lock_count, len(locks), self.board_bytes)], RECORD)
+        locks = pack([(self.shape_ids[shape], rotation, row, column) for shape, rotation, row, column in locks], LOCK)
+        self.records.write(record.tobytes())
+        self.scripts.write(name)
+        self.locks.write(locks.tobytes())
+        self.boards.write(board)
+        self.count += 1
+        self.lock_count += len(locks)
+        self.board_bytes += len(board)
+        self.script_bytes += len(name)
+
+    def close(self):
+        """Write the metadata and the indexes of the store and close its files."""
+        self.records.close()
+        self.locks.close()
+        self.boards.close()
+        self.scripts.close()
+        with open(os.path.join(self.path, META), "w") as meta:
+            json.dump({'version': VERSION, 'shapes': self.shapes, 'count': self.count, 'locks': self.lock_count,
+                       'boards': self.board_bytes, 'scripts': self.script_bytes}, meta)
+        records = np.fromfile(os.path.join(self.path, RECORDS), dtype=RECORD)
+        for name, field in INDEXED.items():
+            order = np.argsort(records[field], kind="stable")
+            np.save(os.path.join(self.path, f"{name}.npy"), records[field][order])
+            np.save(os.path.join(self.path, f"{name}_pos.npy"), order)
+
+    def __enter__(self):
+        """Use the writer on a with statement. It's closed at the end"""
+        return self
+
+    def __exit__(self, *exc):
+        """Close the writer"""
+        self.close()
+
+
+class ResultsStore:
+    """ResultsStore object that reads a store directory. Every file is memory-mapped, so opening a store does not read
+    them, each field can be read as a numpy column and a lookup on an index only reads the pages it needs"""
+    def __init__(self, path):
+        """The initializer for the class.
+
+        Arguments:
+        path -- string with the path of the store directory
+        """
+        self.path = path
+        with open(os.path.join(path, META)) as meta:
+            meta = json.load(meta)
+        if meta['version'] != VERSION:
+            raise ValueError(f"{path} is a store of version {meta['version']}, not {VERSION}")
+        self.shapes = meta['shapes']
+        self.records = self.open(RECORDS, RECORD, meta['count'])
+        self.locks = self.open(LOCKS, LOCK, meta['locks'])
+        self.boards = self.open(BOARDS, np.dtype(np.uint8), meta['boards'])
+        self.scripts = self.open(SCRIPTS, np.dtype(np.uint8), meta['scripts'])
+        # index maps each indexed field to its sorted values and the positions of the records in that order
+        self.index = {name: (np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"),
+                             np.load(os.path.join(path, f"{name}_pos.npy"), mmap_mode="r")) for name in INDEXED}
+
+    def __repr__(self):
+        """Print of the store"""
+        return f"ResultsStore: {self.path}; Records: {len(self.records)}; Locks: {len(self.locks)}"
+
+    def __len__(self):
+        """Number of games of the store"""
+        return len(self.records)
+
+    def open(self, name, dtype, count):
+        """Memory-map a file of the store.
+
+        Arguments:
+        name -- string with the name of the file on the store directory
+        dtype -- numpy dtype of the records of the file
+        count -- int with the number of records
+        Return numpy array with the records, read-only
+        """
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode="r", shape=(count,))
+
+    def column(self, field):
+        """Read one field of every record.
+
+        Arguments:
+        field -- string with the name of the field. E.g 'lines'
+        Return numpy array with one value per record
+        """
+        return self.records[field]
+
+    def find(self, field, value):
+        """Find the records with a value, with the index of the field.
+
+        Arguments:
+        field -- string 'seed' or 'script'
+        value -- int seed or string script id
+        Return numpy int array with the positions of the records, in the order they were saved
+        """
+        values, order = self.index[field]
+        # a key of another dtype would make numpy convert every value of the index before the search
+        key = values.dtype.type(script_hash(value) if field == "script" else value)
+        start, stop = np.searchsorted(values, key, "left"), np.searchsorted(values, key, "right")
+        positions = np.sort(order[start:stop])
+        if field == "script":
+            # ids with the same hash are told apart by the id itself
+            positions = positions[np.array([self.script(position) == value for position in positions], dtype=bool)]
+        return positions
+
+    def script(self, position):
+        """Read the script id of a record.
+
+        Arguments:
+        position -- int with the position of the record
+        Return string with the id
+        """
+        start = int(self.records['script_start'][position])
+        return self.scripts[start:start + int(self.records['script_size'][position])].tobytes().decode("utf-8")
+
+    def board(self, position):
+        """Build the final board of a record.
+
+        Arguments:
+        position -- int with the position of the record
+        Return numpy bool array with N rows and M columns. True where the cell is locked
+        """
+        record = self.records[position]
+        m, n, start = int(record['m']), int(record['n']), int(record['board_start'])
+        width = (m + 7) // 8
+        packed = self.boards[start:start + n * width].reshape(n, width)
+        return np.unpackbits(packed, axis=1, bitorder="little")[:, :m].astype(bool)
+
+    def piece_locks(self, position):
+        """Read the locks of the pieces of a record.
+
+        Arguments:
+        position -- int with the position of the record
+        Return numpy array with the LOCK records of the game, in the order the pieces were locked
+        """
+        start = int(self.records['lock_start'][position])
+        return self.locks[start:start + int(self.records['lock_count'][position])]
@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from commands import read_file
+from game import Game
+from randomizer import MODES, Randomizer
+from results import ResultsWriter
+from shapes import SHAPES
+
+# keys of the run_script results written to the summary. The rows and the locks only go to the results store
+SUMMARY = ("script", "seed", "board", "lines", "pieces", "over", "error")
+
+
+def find_scripts(source):
+    """List the command scripts to run.
+
+    Arguments:
+    source -- string with the path of a directory, where every file is a script, or of a manifest file with one
+    script path per line. Relative paths of a manifest are read from the manifest directory. A path can be followed
+    by a tab and a seed, a non-negative int, e.g 'games/g001.txt<TAB>42', to play the script with the shapes chosen from
+    the seed, as main() --seed. A path may have spaces and end with digits, e.g 'games/run 7'
+    Return list with a (path, seed) tuple per script, in the order they are run. The seed is None when there is none
+    Raise ValueError when the field after the tab of a line is not a seed
+    """
+    if os.path.isdir(source):
+        return sorted((entry.path, None) for entry in os.scandir(source) if entry.is_file())
+    folder = os.path.dirname(source)
+    scripts = []
+    with open(source) as manifest:
+        for number, line in enumerate(manifest, 1):
+            path, tab, seed = line.rstrip("\r\n").partition("\t")
+            if not path.strip():
+                continue
+            seed = seed.strip()
+            if tab and not (seed.isascii() and seed.isdecimal()):
+                raise ValueError(f"{source}:{number}: the seed of a script must be a non-negative int, not {seed!r}")
+            scripts.append((os.path.join(folder, path.strip()), int(seed) if tab else None))
+    return scripts
+
+
+def run_script(path, seed=None, mode="bag"):
+    """Play the game of a script without printing it, as main() does with the same input.
+
+    Arguments:
+    path -- string with the path of a file with the grid dimensions and the commands, one per line
+    seed -- int with the seed of the shapes, as main() --seed. None when 'piece' is followed by the shape
+    mode -- string 'bag' or 'uniform', the mode of the randomizer when there is a seed
+    Return dict with the 'script' path, its 'seed', the final 'board' as a list of grid lines, the number of rows
+    erased on 'lines', the number of pieces created on 'pieces', 'over' True on game over and 'error' with the message
+    when the script could not be run. The grid 'dimensions', the final 'rows' as Board.rows and the 'locks', one list with the
+    shape, rotation, row and column of each piece locked, are kept for the results store
+    """
+    result = {'script': path, 'seed': seed, 'board': None, 'lines': 0, 'pieces': 0, 'over': False, 'error': None,
+              'dimensions': None, 'rows': None, 'locks': []}
+    try:
+        commands = read_file(path)
+        # MxN grid dimensions
+        line = next(commands, None)
+        if line is None:
+            return result
+        game = Game([int(x) for x in line.split()], randomizer=None if seed is None else Randomizer(seed, mode))
+        result['dimensions'] = [game.board.m, game.board.n]
+        # a piece on the floor is locked again by every command until the next piece, so a lock is kept only when
+        # the piece was not locked on the same place before. A locked piece that still moves is locked again elsewhere.
+        # The rows erased again by the repeated locks are not counted either
+        locked = None
+        for command in commands:
+            piece = game.piece
+            events = game.step(command)
+            if game.piece is not None and game.piece is not piece:
+                result['pieces'] += 1
+            if events['locked']:
+                lock = [game.piece.shape, game.piece.rotation, game.piece.row, game.piece.column]
+                if (game.piece, lock) != locked:
+                    locked = (game.piece, lock)
+                    result['locks'].append(lock)
+                    result['lines'] += len(events['erased'])
+            if events['exit']:
+                break
+        result['board'] = game.frame().splitlines()[:game.board.n]
+        result['over'] = game.over
+        result['rows'] = list(game.board.rows)
+    except (OSError, ValueError, IndexError) as error:
+        result['error'] = f"{type(error).__name__}: {error}"
+    return result
+
+
+def run_scripts(scripts, workers=None, chunksize=64, mode="bag"):
+    """Play the scripts on a pool of processes.
+
+    Arguments:
+    scripts -- list with the (path, seed) tuples of find_scripts
+    workers -- int with the number of processes. None to use one per CPU
+    chunksize -- int with the number of scripts sent to a process at once
+    mode -- string 'bag' or 'uniform', the mode of the randomizer of the scripts with a seed
+    Return generator with the dict of run_script for each script, in the order of scripts
+    """
+    paths = [path for path, seed in scripts]
+    seeds = [seed for path, seed in scripts]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(run_script, paths, seeds, repeat(mode), chunksize=chunksize)
+
+
+def parse_args(args=None):
+    """Read the command line options of the runner.
+
+    Arguments:
+    args -- list with the command line arguments. None to read sys.argv
+    Return argparse.Namespace with the options
+    """
+    parser = argparse.ArgumentParser(description="Run many Tetris command scripts on a pool of processes.")
+    parser.add_argument("source", help="directory with the scripts, or manifest file with one script path per line, "
+                                       "optionally followed by a tab and the seed of the shapes")
+    parser.add_argument("-o", "--output", default="summary.jsonl",
+                        help="summary file, with one JSON line per script (default summary.jsonl)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="number of processes (default one per CPU)")
+    parser.add_argument("--chunksize", type=int, default=64,
+                        help="number of scripts sent to a process at once (default 64)")
+    parser.add_argument("--randomizer", choices=MODES, default="bag",
+                        help="for the scripts with a seed, deal every shape once per bag (bag) or each shape "
+                             "independently (uniform)")
+    parser.add_argument("--store", default=None,
+                        help="directory of a results store, where the games are saved as well. See results.py")
+    return parser.parse_args(args)
+
+
+def main():
+    """Run every script of a directory or manifest and write the final boards, the rows erased and the game over
+    status of each one to the summary file. With --store, the games are saved on a results store as well.
+
+    Example:
+    python runner.py games/ --output summary.jsonl --workers 32 --store results/
+    """
+    options = parse_args()
+    scripts = find_scripts(options.source)
+    games = lines = over = errors = 0
+    store = ResultsWriter(options.store, list(SHAPES)) if options.store is not None else None
+    # results are written as they arrive, so the summary of a long run does not stay in memory
+    with open(options.output, "w") as summary:
+        for result in run_scripts(scripts, options.workers, options.chunksize, options.randomizer):
+            # scripts that could not be run, or had no commands, have no final board to save
+            if store is not None and result['rows'] is not None:
+                try:
+                    store.add(result['script'], result['dimensions'], result['rows'], result['lines'],
+                              result['pieces'], result['over'], result['locks'],
+                              -1 if result['seed'] is None else result['seed'])
+                except ValueError as error:
+                    # a game that does not fit the store is reported as the error of its script
+                    result['error'] = f"{type(error).__name__}: {error}"
+            summary.write(json.dumps({key: result[key] for key in SUMMARY}) + "\n")
+            games += 1
+            lines += result['lines']
+            over += result['over']
+            errors += result['error'] is not None
+    if store is not None:
+        store.close()
+    print(f"{games} games, {lines} rows erased, {over} game over, {errors} errors")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+from collections import OrderedDict, deque
+import numpy as np
+from features import features, stack_rows
+from shapes import SHAPES, spawn_column
+
+# columns added to the piece origin by the commands tried by the search. Each of them moves the piece one row down
+SEARCH_MOVES = (("down", 0), ("left", -1), ("right", 1))
+
+
+def default_score(occupancy, erased):
+    """Score the boards of every placement after the piece was locked. Low and flat boards without holes and with rows
+    erased score higher. A board with a full column is game over and gets the lowest score.
+
+    Arguments:
+    occupancy -- numpy bool array with B x N x M locked cells, one board per placement, as features.stack_rows
+    erased -- numpy int array with the number of rows erased by the piece of each placement
+    Return numpy float array with the B scores
+    """
+    found = features(occupancy)
+    score = -0.51 * found['aggregate_height'] + 0.76 * erased - 0.36 * found['holes'] - 0.18 * found['bumpiness']
+    # a full column is locked on every row
+    return np.where(occupancy.all(axis=-2).any(axis=-1), -np.inf, score)
+
+
+def compress(commands):
+    """Join repeated 'down', 'left' and 'right' commands as 'down N', 'left N' and 'right N'.
+
+    Arguments:
+    commands -- list with the command strings. E.g ['left', 'left', 'down', 'drop']
+    Return list with the commands joined. E.g ['left 2', 'down', 'drop']
+    """
+    joined = []
+    for command in commands:
+        if joined and joined[-1][0] == command and command in ("down", "left", "right"):
+            joined[-1][1] += 1
+        else:
+            joined.append([command, 1])
+    return [command if times == 1 else f"{command} {times}" for command, times in joined]
+
+
+class Search:
+    """Search object that finds where a piece can be locked on a board and the commands that take it there.
+    Placements are found by playing every command from each origin the piece can reach, as Game.step does, without
+    printing. Origins reached by different orders of commands are visited once. The placements of each board and piece
+    are kept on a transposition table, and the least recently used entries are dropped when it is full"""
+    def __init__(self, heuristic=default_score, table_size=4096):
+        """The initializer for the class.
+
+        Arguments:
+        heuristic -- function called once per board and piece with the locked cells of the board of every placement
+        and the number of rows each one erased, as default_score, and returning one number per placement. The
+        placement with the highest number is the best
+        table_size -- int with the number of boards and pieces kept on the transposition table
+        """
+        self.heuristic = heuristic
+        self.table_size = table_size
+        # table maps (shape, rotation, row, column, M, N, rows) to the list of placements, the last used at the end
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        """Print of the search"""
+        return f"Search: {len(self.table)}/{self.table_size} entries; Hits: {self.hits}; Misses: {self.misses}"
+
+    def placements(self, board, shape, rotation=0, row=0, column=None):
+        """Find every placement where the piece can be locked, from a piece that was just created or that moved.
+
+        Arguments:
+        board -- Board object with the locked cells of the grid
+        shape -- string with the shape of the piece on the SHAPES registry
+        rotation -- int with the rotation of the piece
+        row -- int with the row of the origin of the piece
+        column -- int with the column of the origin of the piece. None for the column where pieces are created
+        Return list with one dict per placement, the best first: 'commands' list of the commands that lock the piece
+        there, 'rotation', 'row' and 'column' of the locked piece, 'cells' list with its (row, column) tuples,
+        'rows' list with the bitmasks of the board after the full rows are erased, 'erased' int with the number of
+        rows erased and 'score' number given by the heuristic
+        """
+        column = spawn_column(board.m) if column is None else column
+        key = (shape, rotation, row, column, board.m, board.n, tuple(board.rows))
+        found = self.table.get(key)
+        if found is not None:
+            self.hits += 1
+            self.table.move_to_end(key)
+            return found
+        self.misses += 1
+        found = self.explore(board, shape, (rotation, row, column))
+        if found:
+            scores = self.heuristic(stack_rows([placement['rows'] for placement in found], board.m),
+                                    np.array([placement['erased'] for placement in found]))
+            for placement, score in zip(found, scores.tolist()):
+                placement['score'] = score
+        found.sort(key=lambda placement: placement['score'], reverse=True)
+        self.table[key] = found
+        if len(self.table) > self.table_size:
+            self.table.popitem(last=False)
+        return found
+
+    def best(self, board, shape, rotation=0, row=0, column=None):
+        """Find the placement with the highest score. The arguments are the ones of placements.
+
+        Return dict with the best placement. None when the piece can't be locked without game over
+        """
+        found = self.placements(board, shape, rotation, row, column)
+        return found[0] if found else None
+
+    def explore(self, board, shape, start):
+        """Visit every origin the piece can reach from start, in the order of the number of commands.
+
+        Arguments:
+        board -- Board object with the locked cells of the grid
+        shape -- string with the shape of the piece on the SHAPES registry
+        start -- tuple with the rotation, the row and the column of the origin of the piece
+        Return list with the dicts of the placements found, not sorted nor scored
+        """
+        table = SHAPES[shape].tolist()
+        m, n = board.m, board.n
+
+        def cells(rotation, row, column):
+            return [(cell_row + row, cell_column + column) for cell_row, cell_column in table[rotation]]
+
+        def inside(piece_cells):
+            return all(0 <= cell_column < m and cell_row < n for cell_row, cell_column in piece_cells)
+
+        # parents maps each origin visited to the origin before it and the command that moved the piece
+        parents = {start: None}
+        # placements found, by their locked cells, so different origins locking the same cells are kept once
+        found = {}
+
+        def commands(state):
+            path = []
+            while parents[state] is not None:
+                state, command = parents[state]
+                path.append(command)
+            return path[::-1]
+
+        def place(state, command, locked, piece_cells):
+            key = frozenset(piece_cells)
+            if key not in found:
+                found[key] = self.place(board, locked, commands(state) + [command], piece_cells)
+
+        def visit(state, target, command):
+            # origins reached before by other commands are not visited again
+            if target not in parents:
+                parents[target] = (state, command)
+                queue.append(target)
+
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            rotation, row, column = state
+            piece_cells = cells(rotation, row, column)
+            # the next command would end the game
+            if board.full_column(piece_cells):
+                continue
+            # "drop" locks the piece where it lands. On the floor it locks the piece where it is
+            distance = board.drop_distance(piece_cells)
+            place(state, "drop", (rotation, row + distance, column), cells(rotation, row + distance, column))
+            if any(cell_row == n - 1 for cell_row, cell_column in piece_cells):
+                continue
+            for command, move in SEARCH_MOVES:
+                # a move out of the grid walls is a 'down', already tried
+                if move and not inside(cells(rotation, row, column + move)):
+                    continue
+                # a piece that touches another piece is locked where it is
+                if board.collides(cells(rotation, row + 1, column + move)):
+                    place(state, command, state, piece_cells)
+                    continue
+                visit(state, (rotation, row + 1, column + move), command)
+            # a rotation refused is a 'down', already tried
+            rotated = (rotation + 1) % len(table)
+            rotated_cells = cells(rotated, row + 1, column)
+            if inside(rotated_cells) and not board.collides(rotated_cells):
+                visit(state, (rotated, row + 1, column), "rotate")
+        return list(found.values())
+
+    def place(self, board, state, commands, piece_cells):
+        """Lock the cells on a copy of the board rows and erase the full rows.
+
+        Arguments:
+        board -- Board object with the locked cells of the grid
+        state -- tuple with the rotation, the row and the column of the locked piece
+        commands -- list with the commands that lock the piece
+        piece_cells -- list with the (row, column) tuples of the locked piece
+        Return dict with the placement, as described on placements, without its 'score'
+        """
+        rows = list(board.rows)
+        for row, column in piece_cells:
+            if 0 <= row < board.n and 0 <= column < board.m:
+                rows[row] |= 1 << column
+        kept = [bits for bits in rows if bits != board.full_row]
+        erased = board.n - len(kept)
+        rows = [0] * erased + kept
+        rotation, row, column = state
+        return {'commands': compress(commands), 'rotation': rotation, 'row': row, 'column': column,
+                'cells': piece_cells, 'rows': rows, 'erased': erased}
@@ -0,0 +1,180 @@
+import argparse
+import asyncio
+from functools import partial
+from game import Game
+from render import Grid
+from shapes import min_dimensions
+
+# seconds the lines sent after the end of a game are still read before the connection is closed
+LINGER = 5.0
+# largest M and N of a session by default. Every session is kept in the memory of the one server process
+MAX_SIZE = 1024
+
+
+class SessionGrid(Grid):
+    """Grid object of a network session. Frames are kept until they are sent, instead of being printed"""
+    def __init__(self, dimensions):
+        """The initializer for the class.
+
+        Arguments:
+        dimensions -- list with int M and N grid dimensions
+        """
+        super().__init__(dimensions)
+        # frames printed since they were last sent
+        self.frames = []
+
+    def print_grid(self):
+        """Keep the frame to be sent to the player."""
+        self.frames.append(self.frame())
+
+    def flush(self):
+        """Take the frames kept since the last call.
+
+        Return bytes with the frames, as main() prints them
+        """
+        frames = "".join(self.frames).encode("ascii")
+        self.frames = []
+        return frames
+
+
+async def handle(reader, writer, max_size=MAX_SIZE):
+    """Play one game with the lines sent by a player, as main() does with the standard input, and send back every
+    frame. The connection is closed on 'exit', on game over, on an error of the game or when the player closes it.
+
+    Arguments:
+    reader -- asyncio.StreamReader with the lines of the player
+    writer -- asyncio.StreamWriter where the frames are sent
+    max_size -- int with the largest M and N of the grid
+    """
+    try:
+        # MxN grid dimensions
+        line = await reader.readline()
+        if not line:
+            return
+        try:
+            m, n = [int(x) for x in line.decode("ascii").split()]
+            # a piece created on a smaller grid would have cells outside it
+            min_m, min_n = min_dimensions()
+            if not (min_m <= m <= max_size and min_n <= n <= max_size):
+                raise ValueError(f"Grid dimensions must be from {min_m} {min_n} to {max_size}")
+            dimensions = [m, n]
+            grid = SessionGrid(dimensions)
+        except (UnicodeDecodeError, ValueError, TypeError, IndexError):
+            writer.write(b"Invalid grid dimensions\n")
+            return
+        game = Game(dimensions, grid)
+        # display empty grid
+        grid.print_grid()
+        writer.write(grid.flush())
+        await writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                events = game.step(line.decode("ascii", "replace").rstrip("\r\n"))
+            except Exception as error:
+                # an error of the engine ends this session only, the other games go on
+                writer.write(f"Error: {type(error).__name__}: {error}\n".encode("ascii", "replace"))
+                await writer.drain()
+                await discard(reader, writer)
+                break
+            writer.write(grid.flush())
+            if game.over:
+                writer.write(b"Game Over!\n")
+            await writer.drain()
+            if events['exit']:
+                await discard(reader, writer)
+                break
+    except (ConnectionError, ValueError, asyncio.LimitOverrunError):
+        # the player left, or sent a line longer than the reader limit
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def discard(reader, writer):
+    """End the output of a connection and read what the player still sends, as main() ignores the lines after the end
+    of the game. A connection closed with lines not read is reset, and the player could lose the last frames.
+
+    Arguments:
+    reader -- asyncio.StreamReader with the lines of the player
+    writer -- asyncio.StreamWriter where the frames were sent
+    """
+    async def read_all():
+        while await reader.read(1 << 16):
+            pass
+
+    if writer.can_write_eof():
+        writer.write_eof()
+    try:
+        await asyncio.wait_for(read_all(), LINGER)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def serve(host, port, backlog=1024, max_size=MAX_SIZE):
+    """Start the server. Each connection plays its own game, on its own board.
+
+    Arguments:
+    host -- string with the address the server listens on
+    port -- int with the TCP port. 0 to choose a free one
+    backlog -- int with the number of connections waiting to be accepted
+    max_size -- int with the largest M and N of the grid of a session
+    Return asyncio.Server object, already listening
+    """
+    return await asyncio.start_server(partial(handle, max_size=max_size), host, port, backlog=backlog)
+
+
+def parse_args(args=None):
+    """Read the command line options of the server.
+
+    Arguments:
+    args -- list with the command line arguments. None to read sys.argv
+    Return argparse.Namespace with the options
+    """
+    parser = argparse.ArgumentParser(description="Tetris server. Each TCP connection plays one game with the commands "
+                                                 "of main(), one per line, and gets back the frames.")
+    parser.add_argument("--host", default="127.0.0.1", help="address the server listens on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=7777, help="TCP port (default 7777)")
+    parser.add_argument("--max-size", type=int, default=MAX_SIZE,
+                        help=f"largest M and N of the grid of a session (default {MAX_SIZE})")
+    return parser.parse_args(args)
+
+
+async def run(host, port, max_size=MAX_SIZE):
+    """Serve games until the process is stopped.
+
+    Arguments:
+    host -- string with the address the server listens on
+    port -- int with the TCP port
+    max_size -- int with the largest M and N of the grid of a session
+    """
+    server = await serve(host, port, max_size=max_size)
+    for sock in server.sockets:
+        print(f"Serving on {sock.getsockname()[0]}:{sock.getsockname()[1]}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """Serve Tetris games over TCP. The first line of a connection is the grid dimension MxN and the next ones are the
+    commands, as read by main() of game.py.
+
+    Example:
+    python server.py --port 7777
+    printf '10 10\\npiece\\nT\\nright\\nexit\\n' | nc 127.0.0.1 7777
+    """
+    options = parse_args()
+    try:
+        asyncio.run(run(options.host, options.port, options.max_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
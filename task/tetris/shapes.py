@@ -0,0 +1,58 @@
+import numpy as np
+
+# registry with the cells of every shape. The name of the shape is the key and the value is a read-only numpy int
+# array with one (row, column) pair per cell for each rotation: shape (rotations, cells, 2)
+SHAPES = {}
+
+
+def register_shape(name, rotations):
+    """Add a shape to the registry, so pieces with it can be created.
+
+    Arguments:
+    name -- string with the name of the shape, the one read after the 'piece' command. E.g 'T'
+    rotations -- list with one list of (row, column) cells per rotation. Every rotation must have the same number of
+    cells. Row 0 is the top of the grid and column 0 is the column where the piece is created, in the middle of the grid.
+    Return numpy array with the cells saved on the registry
+    """
+    table = np.array(rotations, dtype=np.int64)
+    if table.ndim != 3 or table.shape[2] != 2 or table.shape[1] == 0:
+        raise ValueError(f"Shape {name} must have one list of (row, column) cells per rotation")
+    # the table is shared by every piece with this shape, so it must not change
+    table.flags.writeable = False
+    SHAPES[name] = table
+    return table
+
+
+def spawn_column(width):
+    """Find the column where the pieces are created.
+
+    Arguments:
+    width -- int with the M dimension of the grid
+    Return int with the column. E.g 4 for a 10 columns grid
+    """
+    return width // 2 - 1
+
+
+def min_dimensions():
+    """Find the smallest grid where every registered shape can be created, in any rotation, without cells below the
+    last row or after the last column.
+
+    Return tuple with the int M and N dimensions
+    """
+    n = max(int(cells[..., 0].max()) + 1 for cells in SHAPES.values())
+    m = 1
+    while any(spawn_column(m) + int(cells[..., 1].max()) >= m for cells in SHAPES.values()):
+        m += 1
+    return m, n
+
+
+register_shape("I", [[(0, 0), (1, 0), (2, 0), (3, 0)], [(0, -1), (0, 0), (0, 1), (0, 2)]])
+register_shape("S", [[(0, 1), (0, 0), (1, 0), (1, -1)], [(0, 0), (1, 0), (1, 1), (2, 1)]])
+register_shape("Z", [[(0, 0), (0, 1), (1, 1), (1, 2)], [(0, 1), (1, 1), (1, 0), (2, 0)]])
+register_shape("L", [[(0, 0), (1, 0), (2, 0), (2, 1)], [(0, 1), (1, 1), (1, 0), (1, -1)],
+                     [(0, 0), (0, 1), (1, 1), (2, 1)], [(0, 2), (0, 1), (0, 0), (1, 0)]])
+register_shape("J", [[(0, 1), (1, 1), (2, 1), (2, 0)], [(1, 1), (0, 1), (0, 0), (0, -1)],
+                     [(0, 1), (0, 0), (1, 0), (2, 0)], [(0, 0), (1, 0), (1, 1), (1, 2)]])
+register_shape("O", [[(0, 0), (1, 0), (1, 1), (0, 1)]])
+register_shape("T", [[(0, 0), (1, 0), (2, 0), (1, 1)], [(0, 0), (1, -1), (1, 0), (1, 1)],
+                     [(0, 1), (1, 1), (2, 1), (1, 0)], [(0, 0), (0, 1), (0, 2), (1, 1)]])
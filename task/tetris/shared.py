@@ -0,0 +1,126 @@
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from batch import BatchGame, state_layout
+
+# the block starts with M, N and B as int64, so a worker only needs the name of the block to attach to it
+HEADER = 3 * 8
+
+
+class SharedBoards:
+    """SharedBoards object with the state arrays of B boards on a multiprocessing.shared_memory block. The process that
+    creates the block owns it and must unlink it when every process is done. The other processes attach to it by name
+    and only close it. Each process can play a range of the boards with a BatchGame, without copying them"""
+    def __init__(self, block, owner):
+        """The initializer for the class. Use create or attach to get a SharedBoards object.
+
+        Arguments:
+        block -- shared_memory.SharedMemory object with the header and the arrays
+        owner -- boolean True if this process created the block and must unlink it
+        """
+        self.block = block
+        self.owner = owner
+        m, n, size = np.ndarray((3,), dtype=np.int64, buffer=block.buf)
+        self.dimensions = [int(m), int(n)]
+        self.size = int(size)
+        # arrays maps each name of state_layout to its array of the B boards, a view of the block
+        self.arrays = {}
+        offset = HEADER
+        for name, shape, dtype in state_layout(self.dimensions, self.size):
+            self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+            # every array starts on a multiple of 8 bytes
+            offset += -(-int(np.prod(shape)) * dtype.itemsize // 8) * 8
+
+    def __repr__(self):
+        """Print of the shared boards"""
+        return f"SharedBoards: {self.block.name}; {self.size} boards {self.dimensions[0]}x{self.dimensions[1]}; Owner: {self.owner}"
+
+    @property
+    def name(self):
+        """String with the name of the shared memory block, given to the processes that attach to it"""
+        return self.block.name
+
+    @staticmethod
+    def nbytes(dimensions, size):
+        """Find the size of the block for a number of boards.
+
+        Arguments:
+        dimensions -- list with int M and N grid dimensions
+        size -- int with the number B of boards
+        Return int with the number of bytes
+        """
+        arrays = state_layout(dimensions, size)
+        return HEADER + sum(-(-int(np.prod(shape)) * dtype.itemsize // 8) * 8 for name, shape, dtype in arrays)
+
+    @classmethod
+    def create(cls, dimensions, size, name=None):
+        """Create a shared memory block with B empty boards, owned by this process.
+
+        Arguments:
+        dimensions -- list with int M and N grid dimensions
+        size -- int with the number B of boards
+        name -- string with the name of the block. None for a random name
+        Return SharedBoards object
+        """
+        block = shared_memory.SharedMemory(name=name, create=True, size=cls.nbytes(dimensions, size))
+        block.buf[:block.size] = bytes(block.size)
+        np.ndarray((3,), dtype=np.int64, buffer=block.buf)[:] = [dimensions[0], dimensions[1], size]
+        return cls(block, True)
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to a block created by another process. The block is not unlinked when this process ends.
+
+        Arguments:
+        name -- string with the name of the block
+        Return SharedBoards object
+        """
+        try:
+            block = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # before Python 3.13 every process that attaches also registers the block, and the block would be unlinked
+            # when that process ends. Registering is skipped instead of undone, as forked processes share the resource
+            # tracker of the owner and would remove its registration
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                block = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        return cls(block, False)
+
+    def batch(self, start=0, stop=None):
+        """Play a range of the boards. The BatchGame reads and writes the block, so the other processes see its
+        changes.
+
+        Arguments:
+        start -- int with the index of the first board
+        stop -- int with the index after the last board. None for the last board of the block
+        Return BatchGame object with the boards from start to stop
+        """
+        stop = self.size if stop is None else stop
+        if not 0 <= start <= stop <= self.size:
+            raise IndexError(f"Boards {start} to {stop} are out of the {self.size} boards of the block")
+        arrays = {name: array[start:stop] for name, array in self.arrays.items()}
+        return BatchGame(self.dimensions, stop - start, arrays)
+
+    def close(self):
+        """Stop using the block on this process. The BatchGame objects of the block must be deleted before, as the
+        block can't be closed while its arrays are used."""
+        self.arrays = {}
+        self.block.close()
+
+    def unlink(self):
+        """Free the block. Only the owner unlinks it, after every process closed it or is done with it."""
+        if not self.owner:
+            raise RuntimeError(f"Only the process that created {self.name} can unlink it")
+        self.block.unlink()
+
+    def __enter__(self):
+        """Use the block on a with statement. It's closed at the end, and unlinked as well by the owner"""
+        return self
+
+    def __exit__(self, *exc):
+        """Close the block, and unlink it if this process owns it"""
+        self.close()
+        if self.owner:
+            self.unlink()
@@ -0,0 +1,70 @@
+import random
+import unittest
+from batch import BatchGame, COMMANDS, NOOP
+from game import Game
+from shapes import SHAPES
+
+
+class BatchGameTest(unittest.TestCase):
+    """Every board of a BatchGame must play as a Game with the same commands"""
+    def play(self, dimensions, size, steps, seed):
+        """Play the same random commands on a BatchGame and on one Game per board, comparing them after each step.
+
+        Arguments:
+        dimensions -- list with int M and N grid dimensions
+        size -- int with the number of boards
+        steps -- int with the number of steps
+        seed -- int with the seed of the commands and of the shapes
+        Return tuple with the int number of rows erased and the int number of games over, on every board
+        """
+        rng = random.Random(seed)
+        games = [Game(dimensions) for _ in range(size)]
+        batch = BatchGame(dimensions, size)
+        shapes = [rng.choice(list(SHAPES)) for _ in range(size)]
+        for game, shape in zip(games, shapes):
+            game.step("piece")
+            game.step(shape)
+        batch.spawn(shapes)
+        done = [False] * size
+        erased = 0
+        for step in range(steps):
+            commands = [rng.choice(["down", "down", "left", "right", "rotate", "drop"]) for _ in range(size)]
+            events = batch.step([NOOP if done[b] else COMMANDS[command] for b, command in enumerate(commands)])
+            shapes = [None] * size
+            for b, game in enumerate(games):
+                if done[b]:
+                    continue
+                expected = game.step(commands[b])
+                context = f"step {step}, board {b}, command {commands[b]}"
+                self.assertEqual(expected['locked'], bool(events['locked'][b]), context)
+                self.assertEqual(len(expected['erased']), int(events['erased'][b]), context)
+                self.assertEqual(expected['over'], bool(events['over'][b]), context)
+                self.assertTrue((game.board.occupancy() == batch.occupancy[b]).all(), context)
+                erased += len(expected['erased'])
+                if expected['over']:
+                    done[b] = True
+                elif expected['locked']:
+                    shapes[b] = rng.choice(list(SHAPES))
+                    game.step("piece")
+                    game.step(shapes[b])
+                else:
+                    piece = game.piece
+                    self.assertEqual((piece.row, piece.column, piece.rotation),
+                                     (batch.row[b], batch.column[b], batch.rotation[b]), context)
+            batch.spawn(shapes)
+        return erased, sum(done)
+
+    def test_same_as_game(self):
+        for seed, dimensions in enumerate(([10, 12], [6, 8], [13, 20])):
+            with self.subTest(dimensions=dimensions):
+                self.play(dimensions, 40, 150, seed)
+
+    def test_rows_erased_and_game_over(self):
+        # a narrow grid clears rows and ends games often, so both are compared too
+        erased, over = self.play([4, 8], 40, 150, 3)
+        self.assertGreater(erased, 0)
+        self.assertGreater(over, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
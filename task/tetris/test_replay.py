@@ -0,0 +1,76 @@
+import os
+import random
+import tempfile
+import unittest
+from game import Game
+from randomizer import Randomizer
+from replay import Replay, convert
+from shapes import SHAPES
+
+
+def make_script(seed, dimensions, length, shapes=True):
+    """Build a random script.
+
+    Arguments:
+    seed -- int with the seed of the commands
+    dimensions -- list with int M and N grid dimensions
+    length -- int with the number of commands
+    shapes -- boolean False to leave 'piece' without a shape, as in a game with a randomizer
+    Return list with the lines of the script, the grid dimensions first
+    """
+    rng = random.Random(seed)
+    lines = [f"{dimensions[0]} {dimensions[1]}"]
+    while len(lines) <= length:
+        command = rng.choice(["piece", "down", "down", "down", "left", "right", "rotate", "down 3", "break", "oops"])
+        lines.append(command)
+        if command == "piece" and shapes:
+            lines.append(rng.choice(list(SHAPES)))
+    return lines
+
+
+class ReplayTest(unittest.TestCase):
+    """Every frame of a replay must be the frame of the game after the same number of commands"""
+    def check(self, lines, interval, seed=None, mode="bag"):
+        """Convert a script and compare each frame of the replay with the game played command by command.
+
+        Arguments:
+        lines -- list with the lines of the script, the grid dimensions first
+        interval -- int with the number of commands between two keyframes
+        seed -- int with the seed of the randomizer. None to read the shapes from the script
+        mode -- string 'bag' or 'uniform', the mode of the randomizer
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "game.rpl")
+            count = convert(lines, path, interval, seed, mode)
+            replay = Replay(path)
+        self.assertEqual(len(replay), count)
+        dimensions = [int(x) for x in lines[0].split()]
+        game = Game(dimensions, randomizer=None if seed is None else Randomizer(seed, mode))
+        self.assertEqual(replay.frame(0), game.frame())
+        for frame, command in enumerate(lines[1:count + 1], 1):
+            game.step(command)
+            self.assertEqual(replay.frame(frame), game.frame(), f"frame {frame}")
+        # the randomizer of the last keyframe must go on dealing the same shapes
+        self.assertEqual(replay.seek(count).preview(7), game.preview(7))
+
+    def test_script_shapes(self):
+        for interval in (1, 7, 64):
+            with self.subTest(interval=interval):
+                self.check(make_script(interval, [10, 20], 400), interval)
+
+    def test_seeded(self):
+        for interval, mode in ((1, "bag"), (7, "uniform"), (64, "bag")):
+            with self.subTest(interval=interval, mode=mode):
+                self.check(make_script(interval, [10, 20], 400, shapes=False), interval, seed=interval * 31, mode=mode)
+
+    def test_frame_out_of_replay(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "game.rpl")
+            convert(make_script(0, [10, 10], 20), path, 8)
+            replay = Replay(path)
+        with self.assertRaises(IndexError):
+            replay.frame(len(replay) + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
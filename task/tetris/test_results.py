@@ -0,0 +1,33 @@
+import os
+import tempfile
+import unittest
+from results import ResultsStore, ResultsWriter
+from shapes import SHAPES
+
+
+class ResultsWriterTest(unittest.TestCase):
+    """A game that does not fit the store must be refused without writing any of it"""
+    def test_wide_grid(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with ResultsWriter(folder, list(SHAPES)) as writer:
+                writer.add("wide", [40000, 4], [0, 0, 0, 1 << 39999], 0, 1, False, [("I", 1, 40000, 39999)])
+            store = ResultsStore(folder)
+            self.assertEqual(store.piece_locks(0).tolist(), [(list(SHAPES).index("I"), 1, 40000, 39999)])
+            self.assertTrue(store.board(0)[3, 39999])
+
+    def test_overflow(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with ResultsWriter(folder, list(SHAPES)) as writer:
+                writer.add("first", [4, 4], [0, 0, 0, 1], 0, 1, False, [("O", 0, 2, 0)])
+                with self.assertRaises(ValueError):
+                    writer.add("second", [4, 4], [0, 0, 0, 3], 0, 1, False, [("O", 0, 1 << 40, 0)])
+                writer.add("third", [4, 4], [0, 0, 0, 7], 0, 2, True, [("I", 0, 3, 0)], seed=9)
+            store = ResultsStore(folder)
+            self.assertEqual([store.script(position) for position in range(len(store))], ["first", "third"])
+            self.assertEqual(store.piece_locks(1).tolist(), [(list(SHAPES).index("I"), 0, 3, 0)])
+            self.assertEqual(store.find("seed", 9).tolist(), [1])
+            self.assertEqual(store.find("script", "second").tolist(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from runner import find_scripts, run_script
+
+
+class RunScriptTest(unittest.TestCase):
+    """run_script must count each lock of a piece, and the rows it erases, once"""
+    def run_lines(self, lines):
+        """Write a script and play it with run_script.
+
+        Arguments:
+        lines -- list with the lines of the script, the grid dimensions first
+        Return dict returned by run_script
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "script.txt")
+            with open(path, "w") as script:
+                script.write("\n".join(lines) + "\n")
+            return run_script(path)
+
+    def test_row_erased_once(self):
+        # the I fills the bottom row. The commands after it lock it again on the floor and erase the row again
+        result = self.run_lines(["4 6", "piece", "I", "rotate"] + ["down"] * 8)
+        self.assertIsNone(result['error'])
+        self.assertEqual(result['lines'], 1)
+        self.assertEqual(result['locks'], [['I', 1, 5, 1]])
+        self.assertEqual(result['pieces'], 1)
+
+    def test_one_lock_per_piece(self):
+        result = self.run_lines(["10 8", "piece", "O"] + ["down"] * 10 + ["piece", "I"] + ["down"] * 10)
+        self.assertEqual(result['lines'], 0)
+        self.assertEqual(result['locks'], [['O', 0, 6, 4], ['I', 0, 2, 4]])
+        self.assertEqual(result['pieces'], 2)
+
+
+class FindScriptsTest(unittest.TestCase):
+    """The seed of a manifest line is the field after a tab, so a path can have spaces and end with digits"""
+    def find(self, lines):
+        """Write a manifest and list its scripts.
+
+        Arguments:
+        lines -- list with the lines of the manifest
+        Return tuple with the list returned by find_scripts and the string path of the manifest directory
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "manifest.txt")
+            with open(path, "w") as manifest:
+                manifest.write("\n".join(lines) + "\n")
+            return find_scripts(path), folder
+
+    def test_seed_after_tab(self):
+        scripts, folder = self.find(["games/run 7", "games/g001.txt\t42", "", "games/run 8\t0"])
+        self.assertEqual(scripts, [(os.path.join(folder, "games/run 7"), None),
+                                   (os.path.join(folder, "games/g001.txt"), 42),
+                                   (os.path.join(folder, "games/run 8"), 0)])
+
+    def test_invalid_seed(self):
+        for seed in ("", "-1", "x", "\u00b2"):
+            with self.subTest(seed=seed), self.assertRaises(ValueError):
+                self.find([f"games/g001.txt\t{seed}"])
+
+
+if __name__ == '__main__':
+    unittest.main()